@@ -0,0 +1,413 @@
+import sympy as sp
+import numpy as np
+import copy
+import functools
+import multiprocessing
+
+
+def enum_comb(local_rtn, cur, empty_idx, item):
+
+    if empty_idx > item: return
+    if item == -1:
+        local_rtn.append(cur)
+        return
+
+    b = len(cur)
+    start = max(empty_idx, 0)
+    for i in range(start, b):
+        new_cur = copy.deepcopy(cur)
+        new_cur[i].append(item)
+        new_idx = empty_idx - int(i == empty_idx)
+        enum_comb(local_rtn, new_cur, new_idx, item - 1)
+
+
+def iter_combs(blocks, empty_idx, item):
+    # Same combs, in the same order, as enum_comb, with blocks a tuple of tuples and without
+    # copying the blocks that are left unchanged
+    if empty_idx > item: return
+    if item == -1:
+        yield blocks
+        return
+
+    for i in range(max(empty_idx, 0), len(blocks)):
+        new_blocks = blocks[:i] + (blocks[i] + (item,),) + blocks[i + 1:]
+        yield from iter_combs(new_blocks, empty_idx - int(i == empty_idx), item - 1)
+
+
+def comb_ranges(n, min_ranges=1):
+    # Disjoint (blocks, empty_idx, item) states whose iter_combs, concatenated in order,
+    # enumerate every comb for n terms in the order of am_to_from_gm. Each state fixes the
+    # block count and the blocks of the highest terms (a prefix of the assignment); prefixes
+    # are lengthened one term at a time until there are at least min_ranges states
+    states = [(((),) * num_b, num_b - 2, n - 1) for num_b in range(3, n + 2)]
+    while len(states) < min_ranges:
+        expanded = []
+        for blocks, empty_idx, item in states:
+            if empty_idx > item: continue
+            if item == -1:
+                expanded.append((blocks, empty_idx, item))
+                continue
+            for i in range(max(empty_idx, 0), len(blocks)):
+                new_blocks = blocks[:i] + (blocks[i] + (item,),) + blocks[i + 1:]
+                expanded.append((new_blocks, empty_idx - int(i == empty_idx), item - 1))
+        if len(expanded) == len(states): break
+        states = expanded
+    return states
+
+
+def monomial_exponents(terms):
+    # Exponent-vector form of terms if every term is c * x1**e1 * ... with c a positive
+    # Rational, xi positive Symbols and ei Rationals: (coefficients, symbols, E, L) where
+    # E is an integer matrix with E[t, j] = L * (exponent of symbols[j] in terms[t])
+    coeffs = []
+    powers = []
+    for term in terms:
+        c, rest = term.as_coeff_Mul()
+        if not (c.is_Rational and c.is_positive): return None
+        pd = rest.as_powers_dict()
+        for base, e in pd.items():
+            if base == 1: continue
+            if not (base.is_Symbol and base.is_positive and e.is_Rational): return None
+        coeffs.append(c)
+        powers.append({base: e for base, e in pd.items() if base != 1})
+
+    symbols = sorted(set().union(*powers), key=sp.default_sort_key) if powers else []
+    L = 1
+    for pd in powers:
+        for e in pd.values(): L = sp.ilcm(L, e.q)
+    E = np.zeros((len(terms), len(symbols)), dtype=np.int64)
+    col = {x: j for j, x in enumerate(symbols)}
+    for t, pd in enumerate(powers):
+        for base, e in pd.items(): E[t, col[base]] = e.p * (L // e.q)
+    return coeffs, symbols, E, int(L)
+
+
+def _partitions(n):
+    # Every comb enumerated by am_to_from_gm for n terms, in order, as tuples of blocks; the
+    # lists are kept for at most PARTITIONS_CACHE_MAX_TERMS terms
+    if n in _PARTITIONS: return _PARTITIONS[n]
+    combs = []
+    for state in comb_ranges(n): combs += iter_combs(*state)
+    if n <= PARTITIONS_CACHE_MAX_TERMS: _PARTITIONS[n] = combs
+    return combs
+
+
+# Comb lists grow like the Bell numbers (about 21000 combs for 8 terms, 680000 for 10), so
+# only those of at most this many terms are kept
+PARTITIONS_CACHE_MAX_TERMS = 8
+_PARTITIONS = {}
+
+
+@functools.lru_cache(maxsize=None)
+def _state_count(num_blocks, empty_idx, item):
+    # Number of combs iter_combs yields from a state; it only depends on these three numbers
+    if empty_idx > item: return 0
+    if item == -1: return 1
+    return sum(_state_count(num_blocks, empty_idx - int(i == empty_idx), item - 1)
+               for i in range(max(empty_idx, 0), num_blocks))
+
+
+def comb_count(n):
+    # len(_partitions(n)), without building the combs; this is Bell(n + 1) - 2**n
+    return sum(_state_count(len(blocks), empty_idx, item) for blocks, empty_idx, item in comb_ranges(n))
+
+
+def nth_comb(n, k):
+    # _partitions(n)[k], without building the combs: walks down iter_combs, skipping whole
+    # subtrees by their _state_count
+    if not 0 <= k < comb_count(n): raise IndexError(f"Comb index out of range, got {k} for {n} terms")
+    for blocks, empty_idx, item in comb_ranges(n):
+        count = _state_count(len(blocks), empty_idx, item)
+        if k >= count:
+            k -= count
+            continue
+        while item != -1:
+            for i in range(max(empty_idx, 0), len(blocks)):
+                new_idx = empty_idx - int(i == empty_idx)
+                count = _state_count(len(blocks), new_idx, item - 1)
+                if k < count: break
+                k -= count
+            blocks = blocks[:i] + (blocks[i] + (item,),) + blocks[i + 1:]
+            empty_idx, item = new_idx, item - 1
+        return blocks
+
+
+def clear_caches():
+    # Drop the comb lists and counts memoized by this module
+    _PARTITIONS.clear()
+    _state_count.cache_clear()
+
+
+def _am_to_from_gm_monomial(terms, to_from, combs, coeffs, symbols, E, L):
+    # Same candidates, in the same order, as the generic path of am_to_from_gm. Each distinct
+    # group of terms is reduced once: the exponent vectors of all group products come from a
+    # single membership-matrix product, and every power of a symbol or coefficient is built
+    # at most once per call.
+    n = len(terms)
+    if not combs: return []
+
+    groups = {}
+    for comb in combs:
+        for block in comb: groups.setdefault(block, len(groups))
+    M = np.zeros((len(groups), n), dtype=np.int64)
+    for block, g in groups.items(): M[g, list(block)] = 1
+    S = M @ E  # exponent vectors (times L) of the product of every group
+    group_coeff = [sp.Mul(*[coeffs[i] for i in block]) for block in groups]
+
+    powers = {}
+
+    def power(base, exponent):
+        if (base, exponent) not in powers: powers[(base, exponent)] = sp.Pow(base, exponent)
+        return powers[(base, exponent)]
+
+    def monomial(coeff, row, denom):
+        # coeff * prod(symbols[j] ** (row[j] / denom))
+        return sp.Mul(coeff, *[power(x, sp.Rational(int(e), denom)) for x, e in zip(symbols, row) if e])
+
+    product = {}  # (group, exponent) -> monomial of the group product raised to exponent
+
+    def group_product(g, exponent=1):
+        if (g, exponent) not in product:
+            product[(g, exponent)] = monomial(group_coeff[g] ** exponent, S[g] * exponent, L)
+        return product[(g, exponent)]
+
+    # Exponent vectors (times L) of the geometric-mean radicand for every comb whose leading
+    # blocks are single terms; the 1/m root is applied when converting back to SymPy
+    singleton = [k for k, comb in enumerate(combs) if all(len(block) == 1 for block in comb[:-1])]
+    H = np.zeros((len(singleton), n), dtype=np.int64)
+    for r, k in enumerate(singleton): H[r, [block[0] for block in combs[k][:-1]]] = 1
+    radicand = dict(zip(singleton, H @ E))
+
+    group_sum = {}
+
+    def group_terms(g, block):
+        # new_args entry of the generic path: the group's terms folded with to_from
+        if to_from == sp.Mul or len(block) <= 1: return group_product(g)
+        if g not in group_sum: group_sum[g] = sp.Add(*[terms[i] for i in block])
+        return group_sum[g]
+
+    rtn = []
+    for k, comb in enumerate(combs):
+        m = len(comb) - 1
+        ids = [groups[block] for block in comb[:-1]]
+        if to_from == sp.Add:
+            if k in radicand:
+                # m * (t1 * ... * tm) ** (1/m) straight from the exponent vectors
+                coeff = power(sp.Mul(*[group_coeff[g] for g in ids]), sp.Rational(1, m))
+                new_expr = m * sp.Mul(coeff, monomial(1, radicand[k], L * m))
+            else:
+                new_args = [group_terms(g, block) for g, block in zip(ids, comb)]
+                new_expr = m * sp.Pow(sp.Mul(*new_args), sp.Rational(1, m))
+            # Add flattens nested sums, so the remainder can be added in one call
+            rtn.append(sp.Add(new_expr, *[terms[i] for i in comb[-1]]))
+        else:
+            # The remainder is folded in one term at a time like the generic path, since
+            # SymPy distributes a lone Rational factor over an Add
+            new_args = [group_product(g) for g in ids]
+            new_expr = sp.Pow(sp.Rational(1, m) * sp.Add(*new_args), m)
+            for i in comb[-1]: new_expr = to_from(*[new_expr, terms[i]])
+            rtn.append(new_expr)
+            new_expr = sp.Rational(1, m) * sp.Add(*[group_product(g, m) for g in ids])
+            for i in comb[-1]: new_expr = to_from(*[new_expr, terms[i]])
+            rtn.append(new_expr)
+
+    return rtn
+
+
+def am_to_from_gm(terms, to_from, processes=1):
+
+    if to_from != sp.Add and to_from != sp.Mul: return None
+
+    if processes > 1 and len(terms) >= PARALLEL_MIN_TERMS:
+        return _am_to_from_gm_parallel(terms, to_from, processes)
+    return _combs_candidates(terms, to_from, _partitions(len(terms)))
+
+
+def _combs_candidates(terms, to_from, combs):
+    # Candidates of am_to_from_gm for the given combs, in order
+    vectors = monomial_exponents(terms)
+    if vectors is not None: return _am_to_from_gm_monomial(terms, to_from, combs, *vectors)
+
+    rtn = []
+    for comb in combs: rtn += comb_candidates(terms, to_from, comb)
+    return rtn
+
+
+# Smallest number of terms for which am_to_from_gm splits its combs over processes
+PARALLEL_MIN_TERMS = 7
+# Number of comb ranges handed out per process, so that uneven ranges still balance out
+RANGES_PER_PROCESS = 8
+
+
+def _range_candidates(task):
+    terms, to_from, state = task
+    return _combs_candidates(terms, to_from, list(iter_combs(*state)))
+
+
+def _am_to_from_gm_parallel(terms, to_from, processes):
+    # Each comb range is enumerated and built on its own in a pool process; imap returns the
+    # ranges in order, so the merged candidates are the same as on one process
+    states = comb_ranges(len(terms), processes * RANGES_PER_PROCESS)
+    rtn = []
+    with multiprocessing.Pool(processes) as pool:
+        for candidates in pool.imap(_range_candidates, [(terms, to_from, state) for state in states]):
+            rtn += candidates
+    return rtn
+
+
+def comb_candidates(terms, to_from, comb):
+    # Candidates of am_to_from_gm for a single comb: the AM-GM rewrite for sp.Add, and the
+    # power-of-mean and mean-of-powers GM-AM rewrites for sp.Mul
+    op_map = {sp.Add: 0,
+              sp.Mul: 1}
+
+    new_args = []
+    for b in range(len(comb) - 1):
+        single_term = op_map[to_from]
+        for i in comb[b]: single_term = to_from(*[single_term, terms[i]])
+        new_args.append(single_term)
+    m = len(new_args)
+    if to_from == sp.Add:
+        new_expr = m * sp.Pow(sp.Mul(*new_args), sp.Rational(1, m))
+        for i in comb[-1]: new_expr = to_from(*[new_expr, terms[i]])
+        return [new_expr]
+
+    rtn = []
+    new_expr = sp.Pow(sp.Rational(1, m) * sp.Add(*new_args), m)
+    for i in comb[-1]: new_expr = to_from(*[new_expr, terms[i]])
+    rtn.append(new_expr)
+    new_expr = sp.Rational(1, m) * sp.Add(*[sp.Pow(new_args[i], m) for i in range(m)])
+    for i in comb[-1]: new_expr = to_from(*[new_expr, terms[i]])
+    rtn.append(new_expr)
+    return rtn
+
+
+def sign(term):
+    if term.is_positive: return 1
+    elif term.is_negative: return -1
+    return 0
+
+
+def amgm_expr(expr, label, cache=None, processes=1):
+    # cache maps (expr, label) to the rewrites of expr; it may be shared between calls.
+    # processes > 1 splits the combs of wide sums and products over a process pool
+    if cache is not None:
+        key = (expr, label)
+        if key not in cache: cache[key] = tuple(_amgm_expr(expr, label, cache, processes))
+        return list(cache[key])
+    return _amgm_expr(expr, label, cache, processes)
+
+
+def _amgm_expr(expr, label, cache, processes=1):
+    # print(expr,label)
+
+    f = sign
+
+    if label == 0: return []
+    t = type(expr)
+
+
+    if t == sp.Add:
+        rtn = []
+        children = expr.args
+        n = len(children)
+        children_expr = dict()
+        for i in range(n):
+            child = children[i]
+            children_expr[i] = amgm_expr(child, label, cache, processes)
+        for i in range(n):
+            m = len(children_expr[i])
+            for j in range(m):
+                new_expr = children_expr[i][j]
+                for k in range(n):
+                    if k == i: continue
+                    new_expr += children[k]
+                rtn.append(new_expr)
+        to_apply = []
+        not_to_apply = []
+        for i in range(n):
+            child = children[i]
+            if label == f(child):
+                to_apply.append(label * child)
+            else:
+                not_to_apply.append(child)
+        gm = am_to_from_gm(to_apply, sp.Add, processes)
+        for x in gm:
+            temp = label * x
+            rtn.append(sp.Add(*(not_to_apply + [temp])))
+
+        # print(expr, rtn)
+        return rtn
+
+
+    if t == sp.Pow:
+        power = expr.args[1]
+        new_expr = expr.args[0]
+        if power.is_positive:
+            return [sp.Pow(x, power) for x in amgm_expr(new_expr, label, cache, processes)]
+        elif power.is_negative:
+            return [sp.Pow(x, power) for x in amgm_expr(new_expr, -label, cache, processes)]
+        return []
+
+
+    rtn = []
+    prod = sp.fraction(expr)
+    if type(prod[1])==sp.Mul and f(prod[0])*label==1:
+        numer = amgm_expr(prod[1], -1, cache, processes)
+        rtn += [prod[0] / y for y in numer ]
+        # print(expr, rtn, numer)
+
+
+    if t == sp.Mul:
+
+        children = expr.args
+        n = len(children)
+        left_pos_neg = dict()
+        right_pos_neg = dict()
+
+        left_pos_neg[-1] = 1
+        left_pos_neg[n] = 1
+        right_pos_neg[-1] = 1
+        right_pos_neg[n] = 1
+        for i in range(n):left_pos_neg[i] = left_pos_neg[i - 1] * f(children[i])
+        for i in range(n - 1, -1, -1): right_pos_neg[i] = right_pos_neg[i + 1] * f(children[i])
+        children_expr = dict()
+        for i in range(n):
+            term_pos_neg = left_pos_neg[i - 1] * right_pos_neg[i + 1]
+            children_expr[i] = amgm_expr(children[i], term_pos_neg * label, cache, processes)
+
+        for i in range(n):
+            m = len(children_expr[i])
+            for j in range(m):
+                new_expr = children_expr[i][j]
+                for k in range(n):
+                    if k == i: continue
+                    new_expr *= children[k]
+                rtn.append(new_expr)
+        # print(expr,rtn)
+        pos_terms = [x for x in expr.args if f(x)==1]
+        neg_terms = [x for x in expr.args if f(x)==-1]
+        if (expr.is_positive and label == -1) or (expr.is_negative and label==1):
+            rtn += [sp.Mul(*(neg_terms + [x])) for x in am_to_from_gm(pos_terms, sp.Mul, processes)]
+        # if expr.is_negative and label == 1:
+        #     rtn += [sp.Mul(*(neg_terms + [x])) for x in am_to_from_gm(pos_terms, sp.Mul)]
+
+        return list(set(rtn))
+
+    return []
+
+
+def amgm(expr, cache=None, processes=1):
+
+    t = type(expr)
+    label=1
+    if t==sp.Lt or t==sp.Le: label=1
+    elif t==sp.Ge or t==sp.Gt: label=-1
+    else: return [expr]
+
+    left = expr.args[0]
+    right = expr.args[1]
+    rtn_left = [[l,right,t] for l in amgm_expr(left,label,cache,processes)]
+    rtn_right = [[left,r,t] for r in amgm_expr(right,-label,cache,processes)]
+
+    return rtn_left + rtn_right + [[left,right,t]]
@@ -0,0 +1,189 @@
+import collections
+import pickle
+import numpy as np
+import sympy as sp
+
+from amgm import sign, comb_candidates, comb_count, nth_comb
+
+# Rewrite kinds of a candidate record
+AM_GM = 0  # sum of like-signed terms of an Add replaced by a geometric mean
+GM_AM = 1  # positive factors of a Mul replaced by a power of their arithmetic mean
+GM_AM_POWERS = 2  # positive factors of a Mul replaced by the mean of their powers
+ORIGINAL = 3  # the inequality itself, as emitted last by amgm
+
+# Path step into the denominator of sp.fraction(node); other steps are indices into node.args
+DENOMINATOR = -1
+
+RELATIONS = [sp.Lt, sp.Le, sp.Gt, sp.Ge]
+
+
+class Candidate(collections.namedtuple("Candidate", ["side", "path", "rewrite", "partition", "label"])):
+    """
+    Provenance of one amgm candidate.
+
+    side is 0 for the left-hand side and 1 for the right-hand side of the inequality, path
+    the steps from that side to the rewritten node, rewrite one of AM_GM, GM_AM, GM_AM_POWERS
+    or ORIGINAL, partition the index of the comb into the node's terms, and label the sign
+    (+1 or -1) the rewrite was made for. Records only hold small integers, so they can be
+    sorted, deduplicated and packed in bulk.
+    """
+
+    __slots__ = ()
+
+
+def _records(expr, label, path, out):
+    # Mirrors amgm._amgm_expr, appending records instead of building rewritten expressions
+    if label == 0: return
+    t = type(expr)
+
+    if t == sp.Add:
+        children = expr.args
+        for i in range(len(children)): _records(children[i], label, path + (i,), out)
+        n = len([child for child in children if sign(child) == label])
+        out += [(path, AM_GM, k, label) for k in range(comb_count(n))]
+        return
+
+    if t == sp.Pow:
+        power = expr.args[1]
+        if power.is_positive: _records(expr.args[0], label, path + (0,), out)
+        elif power.is_negative: _records(expr.args[0], -label, path + (0,), out)
+        return
+
+    prod = sp.fraction(expr)
+    if type(prod[1]) == sp.Mul and sign(prod[0]) * label == 1:
+        _records(prod[1], -1, path + (DENOMINATOR,), out)
+
+    if t == sp.Mul:
+        children = expr.args
+        signs = [sign(child) for child in children]
+        for i in range(len(children)):
+            term_pos_neg = 1
+            for k in range(len(children)):
+                if k != i: term_pos_neg *= signs[k]
+            _records(children[i], term_pos_neg * label, path + (i,), out)
+        if (expr.is_positive and label == -1) or (expr.is_negative and label == 1):
+            n = signs.count(1)
+            for k in range(comb_count(n)):
+                out += [(path, GM_AM, k, label), (path, GM_AM_POWERS, k, label)]
+
+
+def candidate_records(expr):
+    """Return the Candidate records of every candidate amgm(expr) would build, in a fixed order."""
+    t = type(expr)
+    if t == sp.Lt or t == sp.Le: label = 1
+    elif t == sp.Ge or t == sp.Gt: label = -1
+    else: return [Candidate(-1, (), ORIGINAL, -1, 0)]
+
+    records = []
+    for side, side_label in ((0, label), (1, -label)):
+        out = []
+        _records(expr.args[side], side_label, (), out)
+        records += [Candidate(side, *record) for record in out]
+    return records + [Candidate(-1, (), ORIGINAL, -1, 0)]
+
+
+def _rewrite_node(node, rewrite, partition, label):
+    if rewrite == AM_GM:
+        to_apply = [label * child for child in node.args if sign(child) == label]
+        not_to_apply = [child for child in node.args if sign(child) != label]
+        x = comb_candidates(to_apply, sp.Add, nth_comb(len(to_apply), partition))[0]
+        return sp.Add(*(not_to_apply + [label * x]))
+
+    pos_terms = [x for x in node.args if sign(x) == 1]
+    neg_terms = [x for x in node.args if sign(x) == -1]
+    x = comb_candidates(pos_terms, sp.Mul, nth_comb(len(pos_terms), partition))[rewrite - GM_AM]
+    return sp.Mul(*(neg_terms + [x]))
+
+
+def _rewrite_at(node, path, rewrite, partition, label):
+    # Rebuilds the ancestors of the rewritten node the same way amgm._amgm_expr does
+    if not path: return _rewrite_node(node, rewrite, partition, label)
+    step, rest = path[0], path[1:]
+
+    if step == DENOMINATOR:
+        numer, denom = sp.fraction(node)
+        return numer / _rewrite_at(denom, rest, rewrite, partition, label)
+
+    t = type(node)
+    children = node.args
+    new_expr = _rewrite_at(children[step], rest, rewrite, partition, label)
+    if t == sp.Pow: return sp.Pow(new_expr, children[1])
+    for k in range(len(children)):
+        if k == step: continue
+        if t == sp.Add: new_expr += children[k]
+        else: new_expr *= children[k]
+    return new_expr
+
+
+def materialize(expr, record):
+    """Build the [lhs, rhs, rel] candidate that record describes for the inequality expr."""
+    if record.rewrite == ORIGINAL:
+        return [expr.args[0], expr.args[1], type(expr)] if type(expr) in RELATIONS else expr
+
+    sides = list(expr.args)
+    sides[record.side] = _rewrite_at(sides[record.side], record.path, record.rewrite, record.partition, record.label)
+    return sides + [type(expr)]
+
+
+def pack_records(records):
+    """Pack records into one flat int32 array of (side, rewrite, partition, label, len(path), *path)."""
+    flat = []
+    for record in records:
+        flat += [record.side, record.rewrite, record.partition, record.label, len(record.path)]
+        flat += record.path
+    return np.array(flat, dtype=np.int32)
+
+
+def unpack_records(array):
+    """Inverse of pack_records."""
+    flat = array.tolist()
+    records = []
+    i = 0
+    while i < len(flat):
+        side, rewrite, partition, label, length = flat[i:i + 5]
+        path = tuple(flat[i + 5:i + 5 + length])
+        records.append(Candidate(side, path, rewrite, partition, label))
+        i += 5 + length
+    return records
+
+
+class CandidateSet:
+    """
+    Lazily materialized amgm candidates of one inequality.
+
+    Holds the inequality once plus a Candidate record per candidate; the SymPy
+    [lhs, rhs, rel] of a candidate is only built when it is accessed. As a set, the
+    materialized candidates equal those of amgm(expr); candidates that amgm merges
+    because they happen to build the same expression keep separate records here.
+    """
+
+    def __init__(self, expr, records=None):
+        self.expr = expr
+        self.records = candidate_records(expr) if records is None else list(records)
+
+    def __len__(self):
+        return len(self.records)
+
+    def __getitem__(self, index):
+        return materialize(self.expr, self.records[index])
+
+    def __iter__(self):
+        for record in self.records:
+            yield materialize(self.expr, record)
+
+    def sort(self):
+        self.records.sort()
+
+    def dedupe(self):
+        """Drop repeated records, keeping the first occurrence of each."""
+        self.records = list(dict.fromkeys(self.records))
+
+    def dump(self, stream):
+        """Write the inequality and the packed records to a binary stream."""
+        pickle.dump((self.expr, pack_records(self.records).tobytes()), stream, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, stream):
+        """Read a CandidateSet written by dump."""
+        expr, packed = pickle.load(stream)
+        return cls(expr, unpack_records(np.frombuffer(packed, dtype=np.int32)))
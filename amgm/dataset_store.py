@@ -0,0 +1,166 @@
+import argparse
+import mmap
+import os
+import pickle
+import numpy as np
+
+
+def index_path(path):
+    """Return the path of the offset index belonging to the data file at path."""
+    return path + ".idx"
+
+
+def is_store(path):
+    """Return whether path is the data file of a DatasetStore."""
+    return os.path.exists(index_path(path))
+
+
+class DatasetWriter:
+    """
+    Append items to a new DatasetStore.
+
+    Every item is pickled on its own and appended to the data file at path; close() (or
+    leaving the with block) writes the offset index that makes the store readable.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "wb")
+        self._offsets = [0]
+
+    def append(self, item):
+        """Append item and return its ID."""
+        data = pickle.dumps(item, protocol=pickle.HIGHEST_PROTOCOL)
+        self._file.write(data)
+        self._offsets.append(self._offsets[-1] + len(data))
+        return len(self._offsets) - 2
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def close(self):
+        if self._file.closed:
+            return
+        self._file.close()
+        with open(index_path(self.path), "wb") as f:
+            np.save(f, np.array(self._offsets, dtype=np.uint64))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+# Stores opened in this process, so that pool workers map each data file only once
+_open_stores = {}
+
+
+def _open_store(path):
+    if path not in _open_stores:
+        _open_stores[path] = DatasetStore(path)
+    return _open_stores[path]
+
+
+class DatasetStore:
+    """
+    Read-only dataset of pickled items with O(1) random access by item ID.
+
+    The data file is memory-mapped and each item is unpickled only when it is accessed, so
+    opening a store costs the same for any size of dataset. Pickling a store only sends its
+    path; pool workers reopen it and share the mapped pages through the OS page cache.
+    """
+
+    def __init__(self, path):
+        if not is_store(path):
+            raise ValueError(f"No dataset store index found for {path}")
+
+        self.path = path
+        self._offsets = np.load(index_path(path), mmap_mode="r")
+        size = int(self._offsets[-1])
+        if os.path.getsize(path) < size:
+            raise ValueError(f"Data file {path} is shorter than its index ({os.path.getsize(path)} < {size} bytes)")
+        if size:
+            with open(path, "rb") as f:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._data = memoryview(self._mmap)
+        else:
+            self._mmap = None  # mmap cannot map an empty file
+            self._data = memoryview(b"")
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def raw(self, index):
+        """Return the pickled bytes of item index as a zero-copy view of the data file."""
+        if not isinstance(index, (int, np.integer)):
+            raise TypeError(f"Item ID must be an integer, got {index} (type: {type(index)})")
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(f"Item ID {index} out of range for a store of {len(self)} items")
+        return self._data[int(self._offsets[index]):int(self._offsets[index + 1])]
+
+    def __getitem__(self, index):
+        return pickle.loads(self.raw(index))
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def __reduce__(self):
+        return _open_store, (self.path,)
+
+    def close(self):
+        self._data.release()
+        if self._mmap is not None:
+            self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def write_store(items, path):
+    """Write items to a new DatasetStore at path; return the count."""
+    with DatasetWriter(path) as writer:
+        for item in items:
+            writer.append(item)
+        return len(writer)
+
+
+def iter_pickles(path):
+    """Yield the items of a level pickle (one list) or of a pickle stream (one item per pickle)."""
+    with open(path, "rb") as f:
+        while True:
+            try:
+                item = pickle.load(f)
+            except EOFError:
+                return
+            if isinstance(item, list):
+                yield from item
+            else:
+                yield item
+
+
+def import_pickle(source, path):
+    """Convert a level pickle or pickle stream at source into a DatasetStore at path; return the count."""
+    return write_store(iter_pickles(source), path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convert level pickles or pickle streams into dataset stores.")
+    parser.add_argument("sources", nargs="+", help="level pickles or pickle streams")
+    parser.add_argument("--suffix", default=".store", help="replaces the extension of each source (default: .store)")
+    args = parser.parse_args(argv)
+
+    for source in args.sources:
+        path = os.path.splitext(source)[0] + args.suffix
+        count = import_pickle(source, path)
+        print(f"imported {count} items from {source} into {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+import argparse
+import multiprocessing
+import pickle
+import random
+import string
+import sympy as sp
+import sys
+import os
+
+# The statement classes live in the sibling math_statement directory
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'math_statement'))
+
+from relational import Relational
+from logical import Logical
+from quantified import Quantified
+from dataset_store import write_store
+
+# Knob presets roughly matching the difficulty of level1_test.pkl .. level3_test.pkl
+LEVELS = {
+    1: dict(num_vars=3, width=3, fraction_depth=0, repeat_rate=0.3),
+    2: dict(num_vars=3, width=3, fraction_depth=1, repeat_rate=0.2),
+    3: dict(num_vars=4, width=3, fraction_depth=2, repeat_rate=0.1),
+}
+
+
+class InequalityGenerator:
+    """
+    Seeded generator of inequalities between expressions in positive symbols.
+
+    num_vars is the number of positive variables, width the maximum number of terms of a
+    sum or factors of a product, fraction_depth how deeply fractions may nest, and
+    repeat_rate the probability that a subexpression is reused from earlier ones instead
+    of built afresh.
+    The same seed and knobs always produce the same sequence of items.
+    """
+
+    POOL_SIZE = 256
+
+    def __init__(self, num_vars=3, width=3, fraction_depth=1, repeat_rate=0.2, seed=0):
+        if not isinstance(num_vars, int) or num_vars < 1:
+            raise ValueError(f"Number of variables must be a positive integer, got {num_vars} (type: {type(num_vars)})")
+        if not isinstance(width, int) or width < 2:
+            raise ValueError(f"Width must be an integer >= 2, got {width} (type: {type(width)})")
+        if not isinstance(fraction_depth, int) or fraction_depth < 0:
+            raise ValueError(f"Fraction depth must be a non-negative integer, got {fraction_depth} (type: {type(fraction_depth)})")
+        if not 0 <= repeat_rate <= 1:
+            raise ValueError(f"Repeat rate must be between 0 and 1, got {repeat_rate} (type: {type(repeat_rate)})")
+
+        if num_vars <= len(string.ascii_lowercase):
+            names = string.ascii_lowercase[:num_vars]
+        else:
+            names = [f"x{i}" for i in range(num_vars)]
+        self.variables = list(sp.symbols(list(names), positive=True))
+        self.width = width
+        self.fraction_depth = fraction_depth
+        self.repeat_rate = repeat_rate
+        self._rng = random.Random(seed)
+        self._pool = []
+
+    def _remember(self, expr):
+        if len(self._pool) < self.POOL_SIZE:
+            self._pool.append(expr)
+        else:
+            self._pool[self._rng.randrange(self.POOL_SIZE)] = expr
+        return expr
+
+    def monomial(self):
+        """Return a random monomial such as 2*a**2*b or a**3/c."""
+        rng = self._rng
+        factors = [sp.Integer(rng.choice([1, 1, 1, 2, 3]))]
+        for _ in range(rng.randint(1, 3)):
+            factors.append(sp.Pow(rng.choice(self.variables), rng.randint(1, 3)))
+        if rng.random() < 0.3:
+            factors.append(sp.Pow(rng.choice(self.variables), -rng.randint(1, 2)))
+        return sp.Mul(*factors)
+
+    def expression(self, fraction_depth=None):
+        """
+        Return a random positive sum of up to width terms.
+
+        Each term is a monomial or, while fraction_depth > 0, a monomial divided by a nested
+        expression of depth fraction_depth - 1, or a product of sums of monomials.
+        """
+        rng = self._rng
+        if fraction_depth is None:
+            fraction_depth = self.fraction_depth
+        if self._pool and rng.random() < self.repeat_rate:
+            return rng.choice(self._pool)
+
+        terms = []
+        for _ in range(rng.randint(2, self.width)):
+            kind = rng.random()
+            if fraction_depth > 0 and kind < 0.4:
+                terms.append(self.monomial() / self.expression(fraction_depth - 1))
+            elif fraction_depth > 0 and kind < 0.55:
+                terms.append(sp.Mul(*[self.expression(0) for _ in range(rng.randint(2, self.width))]))
+            else:
+                terms.append(self.monomial())
+        return self._remember(sp.Add(*terms))
+
+    def inequality(self):
+        """Return a random inequality lhs <= rhs (or lhs < rhs) between positive expressions."""
+        while True:
+            lhs = self.expression()
+            rhs = self.expression()
+            # Unpickling re-evaluates a relational, so skip pairs SymPy can decide outright
+            expr = self._rng.choice([sp.Le, sp.Lt])(lhs, rhs)
+            if isinstance(expr, sp.core.relational.Relational):
+                return expr
+
+    def statement(self):
+        """Return a random inequality as a universally quantified MathStatement over positive variables."""
+        expr = self.inequality()
+        variables = sorted(expr.free_symbols, key=str)
+        domain = [Relational(sp.Integer(0), sp.Lt, var) for var in variables]
+        domain = domain[0] if len(domain) == 1 else Logical(domain, "conjunction")
+        predicate = Relational(expr.lhs, type(expr), expr.rhs)
+        return Quantified(variables, domain, predicate, "universal")
+
+    def items(self, count, statements=False):
+        """Yield count items, inequalities or MathStatements, one at a time."""
+        make = self.statement if statements else self.inequality
+        for _ in range(count):
+            yield make()
+
+
+def _generate_chunk(task):
+    knobs, seed, chunk, count, statements = task
+    # String seeds are hashed deterministically, so every chunk is reproducible on its own
+    generator = InequalityGenerator(seed=f"{seed}:{chunk}", **knobs)
+    return list(generator.items(count, statements))
+
+
+def generate(count, seed=0, statements=False, processes=1, chunk_size=1000, **knobs):
+    """
+    Yield count items generated in independently seeded chunks of chunk_size.
+
+    The output depends only on count, seed, chunk_size and knobs, not on processes; with
+    processes > 1, chunks are generated on a process pool and yielded in order.
+    """
+    tasks = [(knobs, seed, chunk, min(chunk_size, count - start), statements)
+             for chunk, start in enumerate(range(0, count, chunk_size))]
+    if processes == 1:
+        for task in tasks:
+            yield from _generate_chunk(task)
+        return
+
+    with multiprocessing.Pool(processes) as pool:
+        for items in pool.imap(_generate_chunk, tasks):
+            yield from items
+
+
+def write_pickle_stream(items, path):
+    """Write items to path as consecutive pickles, one item at a time; return the count."""
+    count = 0
+    with open(path, "wb") as f:
+        pickler = pickle.Pickler(f, protocol=pickle.HIGHEST_PROTOCOL)
+        for item in items:
+            pickler.dump(item)
+            pickler.clear_memo()  # Keep memory bounded on very long streams
+            count += 1
+    return count
+
+
+def iter_pickle_stream(path):
+    """Yield the items of a file written by write_pickle_stream."""
+    with open(path, "rb") as f:
+        while True:
+            try:
+                yield pickle.load(f)
+            except EOFError:
+                return
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic inequality dataset for load testing.")
+    parser.add_argument("output", help="path of the pickle stream (or dataset store) to write")
+    parser.add_argument("--count", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--level", type=int, choices=sorted(LEVELS), help="use the knobs of a difficulty preset")
+    parser.add_argument("--num-vars", type=int)
+    parser.add_argument("--width", type=int)
+    parser.add_argument("--fraction-depth", type=int)
+    parser.add_argument("--repeat-rate", type=float)
+    parser.add_argument("--statements", action="store_true", help="emit MathStatement trees instead of SymPy inequalities")
+    parser.add_argument("--processes", type=int, default=1)
+    parser.add_argument("--store", action="store_true", help="write an indexed dataset store instead of a pickle stream")
+    args = parser.parse_args(argv)
+
+    knobs = dict(LEVELS[args.level]) if args.level else {}
+    for name in ["num_vars", "width", "fraction_depth", "repeat_rate"]:
+        if getattr(args, name) is not None:
+            knobs[name] = getattr(args, name)
+
+    items = generate(args.count, args.seed, args.statements, args.processes, **knobs)
+    count = (write_store if args.store else write_pickle_stream)(items, args.output)
+    print(f"wrote {count} items to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
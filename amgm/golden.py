@@ -0,0 +1,169 @@
+import argparse
+import json
+import os
+import time
+import sympy as sp
+
+from amgm import amgm
+from candidates import CandidateSet
+from generate_dataset import LEVELS, generate
+from worker import iter_dataset
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def level_path(level):
+    """Return the path of the level pickle of the given difficulty level."""
+    return os.path.join(ROOT, f"level{level}_test.pkl")
+
+
+def canonical_candidates(candidates):
+    """
+    Return candidates as a sorted list without duplicates, each candidate in srepr form.
+
+    An [lhs, rhs, rel] candidate becomes [srepr(lhs), srepr(rhs), rel name]; anything else
+    (amgm returns a non-inequality unchanged) becomes its srepr.
+    """
+    canonical = set()
+    for candidate in candidates:
+        if isinstance(candidate, (list, tuple)):
+            lhs, rhs, rel = candidate
+            canonical.add((sp.srepr(lhs), sp.srepr(rhs), rel.__name__))
+        else:
+            canonical.add((sp.srepr(candidate),))
+    return sorted(canonical)
+
+
+def golden_inputs(levels=(1, 2, 3), generated=0, seed=0, limit=None):
+    """
+    Yield (source, index, expr) for the golden inputs.
+
+    These are the first limit expressions (all if limit is None) of each level pickle,
+    followed by generated expressions per level preset, seeded with seed.
+    """
+    for level in levels:
+        for index, expr in enumerate(iter_dataset(level_path(level))):
+            if limit is not None and index >= limit:
+                break
+            yield f"level{level}", index, expr
+    if generated:
+        for level in levels:
+            for index, expr in enumerate(generate(generated, seed, **LEVELS[level])):
+                yield f"generated{level}:{seed}", index, expr
+
+
+def write_snapshot(path, inputs, engine=amgm):
+    """Write the canonical candidates of engine for every input to path as JSON lines; return the count."""
+    count = 0
+    with open(path, "w") as f:
+        for source, index, expr in inputs:
+            record = {"source": source, "index": index, "expr": sp.srepr(expr),
+                      "candidates": canonical_candidates(engine(expr))}
+            f.write(json.dumps(record) + "\n")
+            count += 1
+    return count
+
+
+def read_snapshot(path):
+    """Yield the records of a snapshot written by write_snapshot."""
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+class DiffReport:
+    """Equivalence and timing of an engine against a snapshot."""
+
+    def __init__(self, engine_name):
+        self.engine_name = engine_name
+        self.items = 0
+        self.mismatches = []  # (source, index, missing, extra) per differing item
+        self.engine_time = 0.0
+        self.reference_time = 0.0
+
+    @property
+    def equivalent(self):
+        return not self.mismatches
+
+    @property
+    def speedup(self):
+        return self.reference_time / self.engine_time if self.engine_time else float("inf")
+
+    def __repr__(self):
+        return (f"DiffReport({self.engine_name}: items={self.items}, mismatches={len(self.mismatches)}, "
+                f"engine={self.engine_time:.2f}s, reference={self.reference_time:.2f}s, speedup={self.speedup:.2f}x)")
+
+
+def diff_engine(snapshot_path, engine, reference=amgm, engine_name=None):
+    """
+    Compare engine to a snapshot, item by item, as unordered candidate sets.
+
+    Both engine and reference (None to skip it) are timed on every input; the reference is
+    only timed, the expected candidates always come from the snapshot.
+    """
+    report = DiffReport(engine_name or getattr(engine, "__name__", repr(engine)))
+    for record in read_snapshot(snapshot_path):
+        expr = sp.sympify(record["expr"])
+        expected = {tuple(candidate) for candidate in record["candidates"]}
+
+        # SymPy's global cache is cleared before each timed call, so that neither call
+        # runs on subexpressions the other one built
+        if reference is not None:
+            sp.core.cache.clear_cache()
+            start = time.perf_counter()
+            reference(expr)
+            report.reference_time += time.perf_counter() - start
+        sp.core.cache.clear_cache()
+        start = time.perf_counter()
+        candidates = engine(expr)
+        report.engine_time += time.perf_counter() - start
+
+        got = {tuple(candidate) for candidate in canonical_candidates(candidates)}
+        report.items += 1
+        if got != expected:
+            report.mismatches.append((record["source"], record["index"], sorted(expected - got), sorted(got - expected)))
+    return report
+
+
+def _cached_amgm():
+    cache = {}
+    return lambda expr: amgm(expr, cache)
+
+
+# Engines selectable from the command line; each factory returns a function of one expression
+ENGINES = {
+    "amgm": lambda: amgm,
+    "amgm-cached": _cached_amgm,
+    "candidates": lambda: lambda expr: list(CandidateSet(expr)),
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Snapshot amgm outputs and diff engines against the snapshot.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    snapshot = commands.add_parser("snapshot", help="write the golden snapshot with the current amgm")
+    snapshot.add_argument("output")
+    snapshot.add_argument("--levels", type=int, nargs="+", default=[1, 2, 3])
+    snapshot.add_argument("--limit", type=int, help="use only the first LIMIT expressions of each level")
+    snapshot.add_argument("--generated", type=int, default=0, help="generated expressions per level")
+    snapshot.add_argument("--seed", type=int, default=0)
+    diff = commands.add_parser("diff", help="diff an engine against a snapshot")
+    diff.add_argument("snapshot")
+    diff.add_argument("--engine", choices=sorted(ENGINES), default="amgm")
+    diff.add_argument("--no-reference", action="store_true", help="do not time the reference amgm")
+    args = parser.parse_args(argv)
+
+    if args.command == "snapshot":
+        inputs = golden_inputs(args.levels, args.generated, args.seed, args.limit)
+        print(f"wrote {write_snapshot(args.output, inputs)} items to {args.output}")
+        return
+
+    report = diff_engine(args.snapshot, ENGINES[args.engine](), None if args.no_reference else amgm, args.engine)
+    print(report)
+    for source, index, missing, extra in report.mismatches:
+        print(f"  {source}[{index}]: {len(missing)} missing, {len(extra)} extra")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,382 @@
+import argparse
+import ast
+import asyncio
+import collections
+import concurrent.futures
+import hashlib
+import json
+import sys
+import time
+import numpy as np
+import sympy as sp
+
+from candidates import candidate_records, materialize
+
+
+def expression_key(expr):
+    """Return the canonical hash of a SymPy expression that identical requests share."""
+    return hashlib.sha256(sp.srepr(expr).encode()).hexdigest()
+
+
+# Literal nodes parse_srepr accepts as they are
+_LITERALS = (str, int, float, bool, type(None))
+# Bounds on literals, so that building the expression stays cheap
+MAX_LITERAL_LENGTH = 1000
+MAX_INTEGER_BITS = 4096
+MAX_FLOAT_PRECISION = 4096
+# Classes built with evaluate=False: evaluating them may take arbitrarily long (Pow, factorial),
+# and the srepr of an expression already holds its evaluated form
+_UNEVALUATED = (sp.Function, sp.core.operations.AssocOp, sp.Pow, sp.core.relational.Relational)
+
+
+def _srepr_constructor(name):
+    value = getattr(sp, name, None) if not name.startswith("_") else None
+    if not (isinstance(value, type) and issubclass(value, sp.Basic)):
+        raise ValueError(f"Disallowed name in expression: {name}")
+    return value
+
+
+def _srepr_literal(value):
+    if isinstance(value, str) and len(value) > MAX_LITERAL_LENGTH:
+        raise ValueError(f"Disallowed string literal longer than {MAX_LITERAL_LENGTH} characters")
+    if isinstance(value, int) and value.bit_length() > MAX_INTEGER_BITS:
+        raise ValueError(f"Disallowed integer literal longer than {MAX_INTEGER_BITS} bits")
+    return value
+
+
+def _srepr_value(node):
+    if isinstance(node, ast.Constant) and isinstance(node.value, _LITERALS):
+        return _srepr_literal(node.value)
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub) and isinstance(node.operand, ast.Constant) \
+            and isinstance(node.operand.value, (int, float)) and not isinstance(node.operand.value, bool):
+        return -_srepr_literal(node.operand.value)
+    if isinstance(node, (ast.Tuple, ast.List)):
+        return tuple(_srepr_value(element) for element in node.elts)
+    if isinstance(node, ast.Name):
+        # Singletons such as pi and oo are printed by name
+        value = getattr(sp, node.id, None) if not node.id.startswith("_") else None
+        if not isinstance(value, sp.Basic):
+            raise ValueError(f"Disallowed name in expression: {node.id}")
+        return value
+    if isinstance(node, ast.Call) and isinstance(node.func, ast.Name):
+        constructor = _srepr_constructor(node.func.id)
+        args = [_srepr_value(arg) for arg in node.args]
+        kwargs = {}
+        for keyword in node.keywords:
+            if keyword.arg is None:
+                raise ValueError("Disallowed ** argument in expression")
+            kwargs[keyword.arg] = _srepr_value(keyword.value)
+        if constructor is sp.Float and any(isinstance(value, int) and value > MAX_FLOAT_PRECISION
+                                           for value in args[1:] + list(kwargs.values())):
+            raise ValueError(f"Disallowed Float precision above {MAX_FLOAT_PRECISION}")
+        if issubclass(constructor, _UNEVALUATED):
+            kwargs["evaluate"] = False
+        return constructor(*args, **kwargs)
+    raise ValueError(f"Disallowed syntax in expression: {type(node).__name__}")
+
+
+def parse_srepr(text):
+    """
+    Rebuild a SymPy expression from its srepr without eval.
+
+    Only calls of SymPy classes (Basic subclasses) by name, SymPy singletons such as pi by
+    name, string, number, bool and None literals, negated numbers and tuples or lists of
+    these are accepted; anything else, such as attribute access, operators or other names,
+    raises ValueError. Operations and functions are built unevaluated, and literals and Float
+    precisions are bounded, so that a request cannot make the parse itself expensive. The
+    result has the same srepr as the expression the text was printed from, and becomes equal
+    to it once rebuilt with evaluation, as unpickling it in a pool process does.
+    """
+    if not isinstance(text, str):
+        raise TypeError(f"Expression must be a string, got {text} (type: {type(text)})")
+    return _srepr_value(ast.parse(text, mode="eval").body)
+
+
+def _parse_request(text):
+    # Runs in a thread: parse an expression and compute its key off the event loop
+    expr = parse_srepr(text)
+    return expression_key(expr), expr
+
+
+def serialize_candidate(candidate):
+    # [lhs, rhs, rel] becomes [srepr(lhs), srepr(rhs), rel name]; anything else its srepr
+    if isinstance(candidate, list):
+        lhs, rhs, rel = candidate
+        return [sp.srepr(lhs), sp.srepr(rhs), rel.__name__]
+    return sp.srepr(candidate)
+
+
+def _materialize_chunk(expr, records):
+    # Runs in a pool process: build and serialize the candidates of a slice of records
+    return [serialize_candidate(materialize(expr, record)) for record in records]
+
+
+class _Computation:
+    """The candidates of one expression, shared by every request for it."""
+
+    def __init__(self, key, expr):
+        self.key = key
+        self.expr = expr
+        self.candidates = []
+        self.done = False
+        self.error = None
+        self._changed = asyncio.Condition()
+
+    async def publish(self, candidates=(), done=False, error=None):
+        async with self._changed:
+            self.candidates += candidates
+            self.done = self.done or done
+            self.error = error
+            self._changed.notify_all()
+
+    async def stream(self):
+        """Yield every candidate, including those published after the call, until done."""
+        i = 0
+        while True:
+            async with self._changed:
+                await self._changed.wait_for(lambda: i < len(self.candidates) or self.done)
+                new = self.candidates[i:]
+                finished = self.done
+            for candidate in new:
+                yield candidate
+            i += len(new)
+            if finished and i == len(self.candidates):
+                return
+
+
+class RewriteService:
+    """
+    Local amgm service that answers JSON-line requests in front of a process pool.
+
+    A request is {"id": ..., "expr": srepr of an inequality}; candidates are streamed back
+    as {"id": ..., "candidate": [lhs, rhs, rel]} lines as soon as a slice of them has been
+    built, followed by {"id": ..., "done": true, "count": ..., "source": ...}. Concurrent
+    requests for the same expression (same expression_key) share one computation, and
+    finished computations are kept in an LRU cache of cache_size entries. At most max_queue
+    computations wait for a dispatcher; further requests are not read until one is taken.
+    {"op": "stats"} returns the request counters and latency percentiles in milliseconds.
+    """
+
+    # Number of candidate records materialized per pool task
+    CHUNK_SIZE = 64
+    # Number of most recent request latencies the percentiles are computed over
+    LATENCY_WINDOW = 10000
+
+    def __init__(self, processes=1, max_queue=64, cache_size=1024):
+        if not isinstance(processes, int) or processes < 1:
+            raise ValueError(f"Processes must be a positive integer, got {processes} (type: {type(processes)})")
+        if not isinstance(max_queue, int) or max_queue < 1:
+            raise ValueError(f"Max queue must be a positive integer, got {max_queue} (type: {type(max_queue)})")
+        if not isinstance(cache_size, int) or cache_size < 0:
+            raise ValueError(f"Cache size must be a non-negative integer, got {cache_size} (type: {type(cache_size)})")
+
+        self.processes = processes
+        self.max_queue = max_queue
+        self.cache_size = cache_size
+        self.counters = collections.Counter()
+        self._latencies = collections.deque(maxlen=self.LATENCY_WINDOW)
+        self._cache = collections.OrderedDict()
+        self._in_flight = {}
+        self._queue = None
+        self._pool = None
+        self._dispatchers = []
+
+    async def start(self):
+        self._queue = asyncio.Queue(self.max_queue)
+        self._pool = concurrent.futures.ProcessPoolExecutor(self.processes)
+        self._dispatchers = [asyncio.create_task(self._dispatch()) for _ in range(self.processes)]
+
+    async def stop(self):
+        for task in self._dispatchers:
+            task.cancel()
+        await asyncio.gather(*self._dispatchers, return_exceptions=True)
+        self._pool.shutdown(cancel_futures=True)
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.stop()
+
+    def stats(self):
+        """Return the request counters and latency percentiles (in milliseconds)."""
+        stats = dict(self.counters)
+        stats["queue_depth"] = self._queue.qsize() if self._queue is not None else 0
+        stats["in_flight"] = len(self._in_flight)
+        stats["cached"] = len(self._cache)
+        if self._latencies:
+            p50, p90, p99 = np.percentile(np.array(self._latencies) * 1000, [50, 90, 99])
+            stats.update(p50_ms=float(p50), p90_ms=float(p90), p99_ms=float(p99))
+        return stats
+
+    async def _dispatch(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            computation = await self._queue.get()
+            try:
+                # The expression is parsed unevaluated; pickling it to the pool evaluates it there
+                records = await loop.run_in_executor(self._pool, candidate_records, computation.expr)
+                chunks = [loop.run_in_executor(self._pool, _materialize_chunk, computation.expr,
+                                               records[start:start + self.CHUNK_SIZE])
+                          for start in range(0, len(records), self.CHUNK_SIZE)]
+                seen = set()
+                for chunk in chunks:
+                    new = []
+                    for candidate in await chunk:
+                        key = json.dumps(candidate)
+                        if key not in seen:
+                            seen.add(key)
+                            new.append(candidate)
+                    await computation.publish(new)
+                await computation.publish(done=True)
+                self._remember(computation)
+            except Exception as e:
+                await computation.publish(done=True, error=f"{type(e).__name__}: {e}")
+            finally:
+                del self._in_flight[computation.key]
+
+    def _remember(self, computation):
+        if self.cache_size == 0:
+            return
+        self._cache[computation.key] = computation
+        self._cache.move_to_end(computation.key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    async def _computation_for(self, key, expr):
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            self.counters["cache_hits"] += 1
+            return self._cache[key], "cache"
+        if key in self._in_flight:
+            self.counters["coalesced"] += 1
+            return self._in_flight[key], "coalesced"
+
+        computation = _Computation(key, expr)
+        self._in_flight[key] = computation
+        self.counters["computed"] += 1
+        await self._queue.put(computation)  # Blocks the caller while the queue is full
+        return computation, "computed"
+
+    async def _single(self, response):
+        yield response
+
+    async def _responses(self, request_id, computation, source, start):
+        count = 0
+        async for candidate in computation.stream():
+            yield {"id": request_id, "candidate": candidate}
+            count += 1
+        if computation.error is not None:
+            self.counters["errors"] += 1
+            yield {"id": request_id, "error": computation.error}
+        else:
+            yield {"id": request_id, "done": True, "count": count, "source": source}
+        self._latencies.append(time.monotonic() - start)
+
+    async def submit(self, request):
+        """
+        Accept one decoded request and return an async iterator over its response dicts.
+
+        Waits while the queue is full and the request needs a new computation.
+        """
+        request_id = request.get("id") if isinstance(request, dict) else None
+        if not isinstance(request, dict):
+            return self._single({"id": None, "error": f"Invalid request: expected a JSON object, got {request}"})
+        if request.get("op") == "stats":
+            return self._single({"id": request_id, "stats": self.stats()})
+
+        start = time.monotonic()
+        self.counters["requests"] += 1
+        try:
+            # Parsed in a thread, so that a long request does not hold up the other connections
+            key, expr = await asyncio.get_running_loop().run_in_executor(None, _parse_request, request["expr"])
+        except Exception as e:
+            self.counters["errors"] += 1
+            return self._single({"id": request_id, "error": f"Invalid request: {type(e).__name__}: {e}"})
+
+        computation, source = await self._computation_for(key, expr)
+        return self._responses(request_id, computation, source, start)
+
+    async def serve_connection(self, reader, writer):
+        """Answer the JSON-line requests read from reader, concurrently, until end of input."""
+
+        async def respond(responses):
+            async for response in responses:
+                writer.write((json.dumps(response) + "\n").encode())
+                await writer.drain()
+
+        tasks = set()
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+            except ValueError as e:
+                responses = self._single({"id": None, "error": f"Invalid request: {e}"})
+            else:
+                # A full queue keeps this connection from reading further requests
+                responses = await self.submit(request)
+            task = asyncio.create_task(respond(responses))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+        await asyncio.gather(*tasks)
+        writer.close()
+
+
+async def serve_unix(path, service):
+    """Serve JSON-line requests on the Unix socket at path until cancelled."""
+    async with service:
+        server = await asyncio.start_unix_server(service.serve_connection, path)
+        async with server:
+            await server.serve_forever()
+
+
+class _StdioReader:
+    # readline() for stdin, which may be a regular file that pipe transports reject
+
+    async def readline(self):
+        return await asyncio.get_running_loop().run_in_executor(None, sys.stdin.buffer.readline)
+
+
+class _StdioWriter:
+    # The part of asyncio.StreamWriter that serve_connection uses, writing to stdout
+
+    def write(self, data):
+        sys.stdout.buffer.write(data)
+
+    async def drain(self):
+        sys.stdout.buffer.flush()
+
+    def close(self):
+        sys.stdout.buffer.flush()
+
+
+async def serve_stdio(service):
+    """Serve JSON-line requests read from stdin, answering on stdout, until end of input."""
+    async with service:
+        await service.serve_connection(_StdioReader(), _StdioWriter())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve amgm rewrites over a Unix socket or stdio.")
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--socket", help="path of the Unix socket to listen on")
+    group.add_argument("--stdio", action="store_true", help="read requests from stdin and answer on stdout")
+    parser.add_argument("--processes", type=int, default=1)
+    parser.add_argument("--max-queue", type=int, default=64)
+    parser.add_argument("--cache-size", type=int, default=1024)
+    args = parser.parse_args(argv)
+
+    service = RewriteService(args.processes, args.max_queue, args.cache_size)
+    if args.stdio:
+        asyncio.run(serve_stdio(service))
+    else:
+        asyncio.run(serve_unix(args.socket, service))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+import sympy as sp
+import sys
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+# The statement classes live in the sibling math_statement directory
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'math_statement'))
+
+from amgm import amgm_expr
+from relational import Relational
+from traversal import walk_paths, replace_at
+
+INEQUALITY_OPERATORS = [sp.Lt, sp.Le]
+
+# Per-process rewrite cache of pool workers, kept across the leaves a worker handles
+_worker_cache = None
+
+
+def _init_worker():
+    global _worker_cache
+    _worker_cache = {}
+
+
+def _rewrite_sides(sides):
+    left, right = sides
+    return (tuple(amgm_expr(left, 1, _worker_cache)),
+            tuple(amgm_expr(right, -1, _worker_cache)))
+
+
+def inequality_leaves(statement):
+    """Return (path, leaf) for every Relational leaf using an inequality operator."""
+    return [(path, node) for path, node in walk_paths(statement)
+            if node.is_relational() and node.operator in INEQUALITY_OPERATORS]
+
+
+class TreeRewriter:
+    """
+    Apply amgm to every inequality leaf of a MathStatement tree.
+
+    Leaves with identical sides are rewritten once. Rewrites of a leaf's sides are kept in
+    cache (a dict keyed by (left, right)) that is shared by all leaves and all statements
+    given to this rewriter, along with the amgm_expr sub-expression cache. With processes > 1,
+    uncached leaves are rewritten on a process pool, each worker keeping its own
+    sub-expression cache across leaves.
+    """
+
+    def __init__(self, processes=1, cache=None):
+        self._processes = None
+        self.processes = processes
+        self.cache = {} if cache is None else cache
+        self._expr_cache = {}
+
+    def _validate_processes(self, value):
+        """Validate that processes is a positive integer."""
+        if not isinstance(value, int) or value < 1:
+            raise ValueError(f"Processes must be a positive integer, got {value} (type: {type(value)})")
+
+    @property
+    def processes(self):
+        return self._processes
+
+    @processes.setter
+    def processes(self, value):
+        self._validate_processes(value)
+        self._processes = value
+
+    def _rewrite_pending(self, pending):
+        if self._processes == 1 or len(pending) == 1:
+            for sides in pending:
+                self.cache[sides] = (tuple(amgm_expr(sides[0], 1, self._expr_cache)),
+                                     tuple(amgm_expr(sides[1], -1, self._expr_cache)))
+            return
+
+        with ProcessPoolExecutor(max_workers=min(self._processes, len(pending)), initializer=_init_worker) as pool:
+            for sides, result in zip(pending, pool.map(_rewrite_sides, pending)):
+                self.cache[sides] = result
+
+    def rewrite_leaves(self, statement):
+        """Return a dict mapping the path of each inequality leaf to its candidate Relationals."""
+        leaves = inequality_leaves(statement)
+        pending = list(dict.fromkeys(
+            (leaf.left, leaf.right) for _, leaf in leaves if (leaf.left, leaf.right) not in self.cache))
+        if pending:
+            self._rewrite_pending(pending)
+
+        candidates = {}
+        for path, leaf in leaves:
+            lefts, rights = self.cache[(leaf.left, leaf.right)]
+            candidates[path] = ([Relational(l, leaf.operator, leaf.right) for l in lefts] +
+                                [Relational(leaf.left, leaf.operator, r) for r in rights])
+        return candidates
+
+    def variants(self, statement):
+        """
+        Yield (path, variant) for every candidate of every inequality leaf.
+
+        Variants are built lazily as they are consumed; each copies only the nodes on the path
+        to the rewritten leaf and shares the rest of statement.
+        """
+        for path, candidates in self.rewrite_leaves(statement).items():
+            for candidate in candidates:
+                yield path, replace_at(statement, path, candidate)
+
+
+def amgm_statement(statement, processes=1, cache=None):
+    """Yield (path, variant) for every amgm rewrite of an inequality leaf of statement."""
+    return TreeRewriter(processes, cache).variants(statement)
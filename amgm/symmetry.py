@@ -0,0 +1,337 @@
+import itertools
+import sympy as sp
+
+from amgm import amgm, amgm_expr, sign, _combs_candidates, _partitions
+
+
+# Inequalities with at most this many symbols are tested against every permutation of them;
+# above it, only transpositions and the cyclic shift are tested and the group is closed
+EXHAUSTIVE_SYMBOLS = 6
+# Closing the group stops after this many permutations (8! = 40320)
+MAX_GROUP_SIZE = 40320
+
+
+def _maps_to(expr, image, mapping):
+    # Whether expr.xreplace(mapping) == image, for a permutation mapping of symbols with equal
+    # assumptions, without rebuilding expr: such a relabeling keeps the tree and only reorders
+    # the arguments of sums and products, whose images are then matched up one by one
+    if not expr.free_symbols: return expr == image
+    if expr.is_Symbol: return mapping.get(expr, expr) == image
+    if type(expr) != type(image) or len(expr.args) != len(image.args): return False
+    if not expr.is_commutative or type(expr) not in (sp.Add, sp.Mul):
+        return all(_maps_to(a, b, mapping) for a, b in zip(expr.args, image.args))
+    unmatched = list(image.args)
+    for arg in expr.args:
+        symbols = {mapping.get(x, x) for x in arg.free_symbols}
+        for j, other in enumerate(unmatched):
+            if other.free_symbols == symbols and _maps_to(arg, other, mapping):
+                del unmatched[j]
+                break
+        else:
+            return False
+    return True
+
+
+def _is_symmetry(expr, mapping):
+    # Only symbols with the same assumptions are exchanged, so that signs of terms are kept
+    if any(x.assumptions0 != y.assumptions0 for x, y in mapping.items()):
+        return False
+    return _maps_to(expr, expr, mapping)
+
+
+def symmetry_group(expr):
+    """
+    Return the permutations of the free symbols of expr that leave expr unchanged.
+
+    Each permutation is a dict mapping every symbol to its image; the identity comes first.
+    Only symbols with equal assumptions are exchanged. For more than EXHAUSTIVE_SYMBOLS
+    symbols the group is the closure of the symmetric transpositions and cyclic shift, which
+    may miss symmetries no generator reaches.
+    """
+    symbols = sorted(expr.free_symbols, key=sp.default_sort_key)
+    identity = {x: x for x in symbols}
+    if len(symbols) < 2:
+        return [identity]
+
+    if len(symbols) <= EXHAUSTIVE_SYMBOLS:
+        group = []
+        for images in itertools.permutations(symbols):
+            mapping = dict(zip(symbols, images))
+            if _is_symmetry(expr, mapping):
+                group.append(mapping)
+        return group
+
+    # Generators as tuples of the indices of the images of the symbols
+    generators = []
+    for i, j in itertools.combinations(range(len(symbols)), 2):
+        images = list(range(len(symbols)))
+        images[i], images[j] = j, i
+        generators.append(tuple(images))
+    generators.append(tuple(range(1, len(symbols))) + (0,))
+    generators = [g for g in generators if _is_symmetry(expr, {x: symbols[k] for x, k in zip(symbols, g)})]
+    group = _generated_group(generators, len(symbols), MAX_GROUP_SIZE)[1]
+    return [{x: symbols[k] for x, k in zip(symbols, p)} for p in group]
+
+
+def _closure(generators, n, limit=None):
+    # Breadth-first closure of permutations of range(n), as tuples, under composition with
+    # the generators, stopping after limit permutations; the identity comes first
+    identity = tuple(range(n))
+    seen = {identity}
+    group = [identity]
+    i = 0
+    while i < len(group) and (limit is None or len(group) < limit):
+        for g in generators:
+            composed = tuple(g[k] for k in group[i])
+            if composed not in seen:
+                seen.add(composed)
+                group.append(composed)
+        i += 1
+    return group
+
+
+def _generated_group(perms, n, limit=None):
+    # (generators, group): the group of permutations of range(n) generated by perms, and the
+    # few of perms needed to generate it, each of which is not generated by the earlier ones
+    group = [tuple(range(n))]
+    generated = set(group)
+    generators = []
+    for perm in perms:
+        if perm in generated: continue
+        generators.append(perm)
+        group = _closure(generators, n, limit)
+        generated = set(group)
+    return generators, group
+
+
+def canonical_candidate(candidate, group):
+    """
+    Return the image of an [lhs, rhs, rel] candidate under group with the smallest sort key.
+
+    This rebuilds the candidate once per element of group; symmetric_amgm does not use it.
+    """
+    if not isinstance(candidate, list):
+        return candidate
+    lhs, rhs, rel = candidate
+    images = [(lhs.xreplace(g), rhs.xreplace(g)) for g in group]
+    lhs, rhs = min(images, key=lambda image: (sp.default_sort_key(image[0]), sp.default_sort_key(image[1])))
+    return [lhs, rhs, rel]
+
+
+def _restrict(group, expr):
+    # The distinct actions of the elements of group on the free symbols of expr
+    symbols = sorted(expr.free_symbols, key=sp.default_sort_key)
+    restricted = {}
+    for g in group:
+        key = tuple(g[x] for x in symbols)
+        if key not in restricted: restricted[key] = dict(zip(symbols, key))
+    return list(restricted.values())
+
+
+def _child_permutations(children, group):
+    # Maps each permutation of the child indices induced by an element of group (all of which
+    # fix the parent) to the elements inducing it. A child's image only depends on the images
+    # of its own symbols, so it is looked up once per distinct image of them, among the
+    # children with the image's free symbols
+    child_symbols = [sorted(child.free_symbols, key=sp.default_sort_key) for child in children]
+    by_symbols = {}
+    for i, child in enumerate(children): by_symbols.setdefault(frozenset(child.free_symbols), []).append(i)
+    images = [{} for _ in children]
+    perms = {}
+    for g in group:
+        perm = []
+        for i, child in enumerate(children):
+            key = tuple(g[x] for x in child_symbols[i])
+            if key not in images[i]:
+                matches = by_symbols[frozenset(key)]
+                images[i][key] = matches[0] if len(matches) == 1 else next(
+                    j for j in matches if _maps_to(child, children[j], g))
+            perm.append(images[i][key])
+        perms.setdefault(tuple(perm), []).append(g)
+    return perms
+
+
+def _orbit_starts(perms, n):
+    # Index of the first child of each orbit of the children under perms
+    starts = []
+    covered = set()
+    for i in range(n):
+        if i in covered: continue
+        starts.append(i)
+        covered.update(perm[i] for perm in perms)
+    return starts
+
+
+def child_orbit_representatives(side, group):
+    """Return the index of the first child of each orbit of side's children under group."""
+    return set(_orbit_starts(_child_permutations(side.args, group), len(side.args)))
+
+
+def _comb_key(comb):
+    # A comb as unordered groups plus the remainder; the order of groups and terms in them
+    # does not change its rewrite
+    return frozenset(frozenset(block) for block in comb[:-1]), frozenset(comb[-1])
+
+
+def comb_orbit_representatives(combs, perms):
+    """
+    Return the first comb of each orbit of combs under perms, a group of permutations of
+    the term indices.
+
+    Rewrites built from combs of one orbit are images of each other under the symmetries
+    inducing perms, so only the representatives need to be built. Each orbit is enumerated
+    from a few generators of perms, so the cost grows with the orbit sizes, not with perms.
+    """
+    perms = list(perms)
+    generators = _generated_group(perms, len(perms[0]))[0] if perms else []
+    seen = set()
+    representatives = []
+    for comb in combs:
+        key = _comb_key(comb)
+        if key in seen: continue
+        representatives.append(comb)
+        seen.add(key)
+        orbit = [key]
+        while orbit:
+            groups, remainder = orbit.pop()
+            for perm in generators:
+                image = (frozenset(frozenset(perm[i] for i in block) for block in groups),
+                         frozenset(perm[i] for i in remainder))
+                if image not in seen:
+                    seen.add(image)
+                    orbit.append(image)
+    return representatives
+
+
+def _term_permutations(perms, positions):
+    # perms restricted to the children at positions, renumbered as indices into them; the
+    # symmetries keep signs, so they map these children among themselves
+    number = {i: j for j, i in enumerate(positions)}
+    return {tuple(number[perm[i]] for i in positions) for perm in perms}
+
+
+def _stabilizer(perms, i):
+    return [g for perm, elements in perms.items() if perm[i] == i for g in elements]
+
+
+def _symmetric_expr(expr, label, group, cache, processes):
+    # Mirrors amgm._amgm_expr for the rewrites of expr, where every element of group fixes
+    # expr and every node above it. Only one child per orbit of children is rewritten, with the
+    # stabilizer of that child, and only one comb per orbit of combs is built; subtrees whose
+    # group is trivial are handed to amgm_expr
+    if label == 0: return []
+    group = _restrict(group, expr)
+    if len(group) == 1: return amgm_expr(expr, label, cache, processes)
+    t = type(expr)
+
+    if t == sp.Add:
+        rtn = []
+        children = expr.args
+        n = len(children)
+        perms = _child_permutations(children, group)
+        for i in _orbit_starts(perms, n):
+            for new_expr in _symmetric_expr(children[i], label, _stabilizer(perms, i), cache, processes):
+                for k in range(n):
+                    if k == i: continue
+                    new_expr += children[k]
+                rtn.append(new_expr)
+        positions = [i for i in range(n) if sign(children[i]) == label]
+        to_apply = [label * children[i] for i in positions]
+        not_to_apply = [children[i] for i in range(n) if sign(children[i]) != label]
+        combs = comb_orbit_representatives(_partitions(len(to_apply)), _term_permutations(perms, positions))
+        for x in _combs_candidates(to_apply, sp.Add, combs):
+            rtn.append(sp.Add(*(not_to_apply + [label * x])))
+        return rtn
+
+    if t == sp.Pow:
+        power = expr.args[1]
+        if power.is_positive:
+            return [sp.Pow(x, power) for x in _symmetric_expr(expr.args[0], label, group, cache, processes)]
+        elif power.is_negative:
+            return [sp.Pow(x, power) for x in _symmetric_expr(expr.args[0], -label, group, cache, processes)]
+        return []
+
+    rtn = []
+    prod = sp.fraction(expr)
+    if type(prod[1]) == sp.Mul and sign(prod[0]) * label == 1:
+        rtn += [prod[0] / y for y in _symmetric_expr(prod[1], -1, group, cache, processes)]
+
+    if t == sp.Mul:
+        children = expr.args
+        n = len(children)
+        signs = [sign(child) for child in children]
+        perms = _child_permutations(children, group)
+        for i in _orbit_starts(perms, n):
+            term_pos_neg = 1
+            for k in range(n):
+                if k != i: term_pos_neg *= signs[k]
+            for new_expr in _symmetric_expr(children[i], term_pos_neg * label, _stabilizer(perms, i), cache, processes):
+                for k in range(n):
+                    if k == i: continue
+                    new_expr *= children[k]
+                rtn.append(new_expr)
+        if (expr.is_positive and label == -1) or (expr.is_negative and label == 1):
+            positions = [i for i in range(n) if signs[i] == 1]
+            pos_terms = [children[i] for i in positions]
+            neg_terms = [children[i] for i in range(n) if signs[i] == -1]
+            combs = comb_orbit_representatives(_partitions(len(pos_terms)), _term_permutations(perms, positions))
+            rtn += [sp.Mul(*(neg_terms + [x])) for x in _combs_candidates(pos_terms, sp.Mul, combs)]
+        return list(dict.fromkeys(rtn))
+
+    return []
+
+
+def _shape(expr, label):
+    # expr printed with the arguments of every node sorted and every symbol replaced by label
+    # of it. A symmetry only relabels symbols within their orbits and reorders arguments, so
+    # this is the same for a whole orbit of expressions
+    if expr.is_Symbol: return label.get(expr, expr.name)
+    if not expr.args: return sp.srepr(expr)
+    return f"{type(expr).__name__}({','.join(sorted(_shape(arg, label) for arg in expr.args))})"
+
+
+def _distinct_orbits(candidates, group):
+    # Drops candidates that are images of an earlier one under group. Candidates are bucketed
+    # by _shape, with every symbol labelled by the smallest symbol of its orbit; only those
+    # sharing a bucket are compared image by image
+    orbits = {}
+    for g in group:
+        for x, y in g.items(): orbits.setdefault(x, set()).add(y)
+    label = {x: min(orbit, key=sp.default_sort_key).name for x, orbit in orbits.items()}
+
+    buckets = {}
+    rtn = []
+    for candidate in candidates:
+        lhs, rhs, rel = candidate
+        bucket = buckets.setdefault((_shape(lhs, label), _shape(rhs, label)), [])
+        if any(_maps_to(lhs, other[0], g) and _maps_to(rhs, other[1], g) for other in bucket for g in group):
+            continue
+        bucket.append(candidate)
+        rtn.append(candidate)
+    return rtn
+
+
+def symmetric_amgm(expr, cache=None, processes=1):
+    """
+    amgm candidates of expr with one representative per orbit under its symmetry group.
+
+    Generation is pruned at every sum and product, using the symmetries that fix the path
+    down to it: only one child per orbit of children is rewritten individually, and the
+    AM-GM rewrites of the node as a whole are built for one comb per orbit of combs.
+    Coincidences between the remaining candidates are removed with a cheap orbit invariant,
+    and the inequality itself is still emitted last. Subtrees without symmetry, and
+    inequalities without any, are rewritten by plain amgm with cache and processes.
+    """
+    group = symmetry_group(expr)
+    if len(group) == 1:
+        return amgm(expr, cache, processes)
+
+    t = type(expr)
+    if t == sp.Lt or t == sp.Le: label = 1
+    elif t == sp.Ge or t == sp.Gt: label = -1
+    else: return [expr]
+
+    left, right = expr.args
+    candidates = [[l, right, t] for l in _symmetric_expr(left, label, group, cache, processes)]
+    candidates += [[left, r, t] for r in _symmetric_expr(right, -label, group, cache, processes)]
+    return _distinct_orbits(candidates, group) + [[left, right, t]]
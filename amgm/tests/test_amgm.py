@@ -0,0 +1,126 @@
+import pytest
+import sympy as sp
+import sys
+import os
+
+# Add the parent directory to the path so we can import the modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import amgm as amgm_module
+from amgm import amgm, amgm_expr, am_to_from_gm, monomial_exponents, enum_comb, iter_combs, comb_ranges
+from amgm import comb_count, nth_comb, clear_caches
+
+
+class TestAmgm:
+    """Test cases for the amgm rewriter."""
+
+    def setup_method(self):
+        """Set up test fixtures before each test method."""
+        self.x, self.y, self.z, self.w = sp.symbols('x y z w', positive=True)
+
+    def test_two_term_sum(self):
+        """Test AM-GM on the left and GM-AM on the right of a simple inequality."""
+        x, y = self.x, self.y
+        expr = sp.Le(x + y, x * y + 1)
+        candidates = amgm(expr)
+        # The order of rewrites from one node is not deterministic, so compare as a set
+        assert {tuple(c) for c in candidates} == {
+            (2 * sp.sqrt(x) * sp.sqrt(y), x * y + 1, sp.Le),
+            (x + y, (x / 2 + y / 2)**2 + 1, sp.Le),
+            (x + y, x**2 / 2 + y**2 / 2 + 1, sp.Le),
+            (x + y, x * y + 1, sp.Le),
+        }
+        assert candidates[-1] == [x + y, x * y + 1, sp.Le]
+
+    def test_non_inequality(self):
+        """Test that anything but an inequality is returned unchanged."""
+        expr = sp.Eq(self.x, self.y)
+        assert amgm(expr) == [expr]
+
+    def test_cache_gives_same_candidates(self):
+        """Test that a shared rewrite cache does not change the candidates."""
+        x, y, z, w = self.x, self.y, self.z, self.w
+        expr = 1 < 1 / (1 + 1 / ((x + y) * (z + w)))
+        cache = {}
+        expected = {tuple(c) for c in amgm(expr)}
+        assert {tuple(c) for c in amgm(expr, cache)} == expected
+        assert {tuple(c) for c in amgm(expr, cache)} == expected
+        assert (x + y, -1) in cache
+        assert set(amgm_expr(x + y, -1, cache)) == set(amgm_expr(x + y, -1))
+
+    def test_monomial_exponents(self):
+        """Test the exponent-vector form of monomials in positive symbols."""
+        x, y, z = self.x, self.y, self.z
+        coeffs, symbols, E, L = monomial_exponents([x**2 * y, 3 * z / sp.sqrt(x), sp.Integer(2)])
+        assert coeffs == [1, 3, 2]
+        assert symbols == [x, y, z]
+        assert L == 2
+        assert E.tolist() == [[4, 2, 0], [-1, 0, 2], [0, 0, 0]]
+
+        a = sp.Symbol('a')
+        assert monomial_exponents([a, x]) is None
+        assert monomial_exponents([-x, y]) is None
+        assert monomial_exponents([x + y, z]) is None
+
+    def test_monomial_fast_path_matches_generic(self, monkeypatch):
+        """Test that the exponent-vector fast path emits the generic candidates in order."""
+        x, y, z, w = self.x, self.y, self.z, self.w
+        inputs = [
+            [x**2 * y, 3 * z / w, sp.Rational(1, 2) * x * z**3],
+            [x, y, z, w],
+            [2 * x**sp.Rational(1, 3), y**2 / x, 5 * w, z * w / y, sp.Integer(4)],
+        ]
+        fast = {}
+        for terms in inputs:
+            for op in (sp.Add, sp.Mul):
+                fast[(tuple(terms), op)] = am_to_from_gm(terms, op)
+
+        monkeypatch.setattr(amgm_module, "monomial_exponents", lambda terms: None)
+        for terms in inputs:
+            for op in (sp.Add, sp.Mul):
+                assert fast[(tuple(terms), op)] == am_to_from_gm(terms, op)
+
+    def test_comb_ranges_cover_enum_comb(self):
+        """Test that the comb ranges enumerate the combs of enum_comb, in order."""
+        for n in range(7):
+            expected = []
+            for num_b in range(3, n + 2):
+                combs = []
+                enum_comb(combs, [[] for _ in range(num_b)], num_b - 2, n - 1)
+                expected += [tuple(tuple(block) for block in comb) for comb in combs]
+            for min_ranges in [1, 4, 50]:
+                states = comb_ranges(n, min_ranges)
+                assert [comb for state in states for comb in iter_combs(*state)] == expected
+
+    def test_comb_count_and_nth_comb(self, monkeypatch):
+        """Test that combs are counted and indexed without building the lists, which stay bounded."""
+        clear_caches()
+        monkeypatch.setattr(amgm_module, "PARTITIONS_CACHE_MAX_TERMS", 5)
+        for n in range(8):
+            combs = amgm_module._partitions(n)
+            assert comb_count(n) == len(combs) == sp.bell(n + 1) - 2**n
+            assert [nth_comb(n, k) for k in range(len(combs))] == combs
+        assert sorted(amgm_module._PARTITIONS) == [0, 1, 2, 3, 4, 5]
+        assert comb_count(12) == sp.bell(13) - 2**12
+        with pytest.raises(IndexError, match="Comb index out of range"):
+            nth_comb(4, comb_count(4))
+        clear_caches()
+        assert amgm_module._PARTITIONS == {}
+
+    def test_parallel_matches_serial(self, monkeypatch):
+        """Test that splitting the combs over processes merges to the serial candidates."""
+        x, y, z, w = self.x, self.y, self.z, self.w
+        monkeypatch.setattr(amgm_module, "PARALLEL_MIN_TERMS", 4)
+        monomials = [x**2 * y, 3 * z / w, x * z, y * w, sp.Integer(2)]
+        sums = [x + 1, y * z, w, x * y + z, sp.Integer(3)]
+        for terms in [monomials, sums]:
+            for op in (sp.Add, sp.Mul):
+                assert am_to_from_gm(terms, op, processes=2) == am_to_from_gm(terms, op)
+
+        expr = sp.Le(x + y + z + w + x * y, x * y * z * w + 5)
+        assert {tuple(c) for c in amgm(expr, processes=2)} == {tuple(c) for c in amgm(expr)}
+
+
+if __name__ == "__main__":
+    # Run tests if this file is executed directly
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,87 @@
+import io
+import pytest
+import sympy as sp
+import sys
+import os
+
+# Add the parent directory to the path so we can import the modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from amgm import amgm
+from candidates import (Candidate, CandidateSet, candidate_records, materialize, pack_records, unpack_records,
+                        AM_GM, GM_AM, GM_AM_POWERS, ORIGINAL, DENOMINATOR)
+
+
+class TestCandidates:
+    """Test cases for compact candidate records."""
+
+    def setup_method(self):
+        """Set up test fixtures before each test method."""
+        self.x, self.y, self.z, self.w = sp.symbols('x y z w', positive=True)
+
+    def test_records_of_two_term_sum(self):
+        """Test the records of a simple inequality and what they materialize to."""
+        x, y = self.x, self.y
+        expr = sp.Le(x + y, x * y + 1)
+        records = candidate_records(expr)
+        assert records == [
+            Candidate(0, (), AM_GM, 0, 1),
+            Candidate(1, (1,), GM_AM, 0, -1),
+            Candidate(1, (1,), GM_AM_POWERS, 0, -1),
+            Candidate(-1, (), ORIGINAL, -1, 0),
+        ]
+        assert materialize(expr, records[0]) == [2 * sp.sqrt(x) * sp.sqrt(y), x * y + 1, sp.Le]
+        assert materialize(expr, records[-1]) == [x + y, x * y + 1, sp.Le]
+
+    def test_materialized_set_matches_amgm(self):
+        """Test that the records materialize to exactly the candidates of amgm."""
+        x, y, z, w = self.x, self.y, self.z, self.w
+        for expr in [
+            1 < 1 / (1 + 1 / ((x + y) * (z + w))),
+            sp.Ge(x * y * z, (x + y) / (z + 2 * w)),
+            sp.Lt(x + y + z, x * y * z + 3),
+        ]:
+            candidates = CandidateSet(expr)
+            assert {tuple(c) for c in candidates} == {tuple(c) for c in amgm(expr)}
+
+    def test_denominator_step(self):
+        """Test that rewrites inside a denominator are recorded with the DENOMINATOR step."""
+        x, y, z = self.x, self.y, self.z
+        expr = sp.Le(x / (y * z), 1)
+        records = candidate_records(expr)
+        assert any(DENOMINATOR in record.path for record in records)
+        assert {tuple(materialize(expr, r)) for r in records} == {tuple(c) for c in amgm(expr)}
+
+    def test_non_inequality(self):
+        """Test that anything but an inequality only has the original record."""
+        expr = sp.Eq(self.x, self.y)
+        candidates = CandidateSet(expr)
+        assert len(candidates) == 1
+        assert candidates[0] == expr
+
+    def test_sort_dedupe_and_packing(self):
+        """Test that records sort, dedupe and round-trip through the packed form."""
+        x, y, z, w = self.x, self.y, self.z, self.w
+        expr = 1 < 1 / (1 + 1 / ((x + y) * (z + w)))
+        candidates = CandidateSet(expr)
+        records = candidates.records
+        assert unpack_records(pack_records(records)) == records
+
+        candidates.records = records + records[:3]
+        candidates.dedupe()
+        assert candidates.records == records
+        candidates.sort()
+        assert candidates.records == sorted(records)
+
+        stream = io.BytesIO()
+        candidates.dump(stream)
+        stream.seek(0)
+        loaded = CandidateSet.load(stream)
+        assert loaded.expr == expr
+        assert loaded.records == candidates.records
+        assert loaded[0] == candidates[0]
+
+
+if __name__ == "__main__":
+    # Run tests if this file is executed directly
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,84 @@
+import pickle
+import pytest
+import sys
+import os
+
+# Add the parent directory to the path so we can import the modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dataset_store import DatasetStore, DatasetWriter, import_pickle, write_store, is_store
+from generate_dataset import generate, write_pickle_stream
+from worker import BatchWorker, iter_dataset
+
+
+class TestDatasetStore:
+    """Test cases for the indexed, memory-mapped dataset store."""
+
+    def setup_method(self):
+        """Set up test fixtures before each test method."""
+        self.items = list(generate(8, seed=0, fraction_depth=1))
+
+    def test_random_access(self, tmp_path):
+        """Test that items are decoded by ID in any order."""
+        path = str(tmp_path / "data.store")
+        with DatasetWriter(path) as writer:
+            ids = [writer.append(item) for item in self.items]
+        assert ids == list(range(len(self.items)))
+        assert is_store(path)
+
+        with DatasetStore(path) as store:
+            assert len(store) == len(self.items)
+            assert store[5] == self.items[5]
+            assert store[0] == self.items[0]
+            assert store[-1] == self.items[-1]
+            assert pickle.loads(store.raw(3)) == self.items[3]
+            assert list(store) == self.items
+            with pytest.raises(IndexError, match="out of range"):
+                store[len(self.items)]
+            with pytest.raises(TypeError, match="Item ID must be an integer"):
+                store["0"]
+
+    def test_empty_store(self, tmp_path):
+        """Test that a store without items can be written and opened."""
+        path = str(tmp_path / "empty.store")
+        assert write_store([], path) == 0
+        assert list(DatasetStore(path)) == []
+
+    def test_missing_index(self, tmp_path):
+        """Test that opening a file without an index is rejected."""
+        path = str(tmp_path / "stream.pkl")
+        write_pickle_stream(self.items, path)
+        with pytest.raises(ValueError, match="No dataset store index found"):
+            DatasetStore(path)
+
+    def test_import_pickles(self, tmp_path):
+        """Test that level pickles and pickle streams convert to the same store contents."""
+        level_path = str(tmp_path / "level.pkl")
+        with open(level_path, "wb") as f:
+            pickle.dump(self.items, f)
+        stream_path = str(tmp_path / "stream.pkl")
+        write_pickle_stream(self.items, stream_path)
+
+        for source in [level_path, stream_path]:
+            path = source + ".store"
+            assert import_pickle(source, path) == len(self.items)
+            assert list(DatasetStore(path)) == self.items
+            assert list(iter_dataset(path)) == self.items
+
+    def test_pickled_store_and_workers(self, tmp_path):
+        """Test that a store is sent to pool workers by path and processed like a list."""
+        path = str(tmp_path / "data.store")
+        write_store(self.items, path)
+        store = DatasetStore(path)
+        assert len(pickle.dumps(store)) < 200
+        assert pickle.loads(pickle.dumps(store))[2] == self.items[2]
+
+        from_store = BatchWorker(processes=2).run({"a": store})
+        from_list = BatchWorker(processes=2).run({"a": self.items})
+        assert from_store["a"].items == len(self.items)
+        assert from_store["a"].candidates == from_list["a"].candidates
+
+
+if __name__ == "__main__":
+    # Run tests if this file is executed directly
+    pytest.main([__file__, "-v"])
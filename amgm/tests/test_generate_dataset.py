@@ -0,0 +1,59 @@
+import pytest
+import sympy as sp
+import sys
+import os
+
+# Add the parent directory to the path so we can import the modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from generate_dataset import InequalityGenerator, LEVELS, generate, write_pickle_stream, iter_pickle_stream
+
+
+class TestGenerateDataset:
+    """Test cases for the synthetic inequality generator."""
+
+    def test_seeded_generation_is_reproducible(self):
+        """Test that the same seed and knobs give the same items, with or without a pool."""
+        first = list(generate(25, seed=3, chunk_size=10, **LEVELS[2]))
+        assert first == list(generate(25, seed=3, chunk_size=10, **LEVELS[2]))
+        assert first == list(generate(25, seed=3, chunk_size=10, processes=2, **LEVELS[2]))
+        assert first != list(generate(25, seed=4, chunk_size=10, **LEVELS[2]))
+
+    def test_inequalities_use_positive_variables(self):
+        """Test that inequalities only mention the generator's positive variables."""
+        generator = InequalityGenerator(num_vars=4, width=4, fraction_depth=2, seed=1)
+        for expr in generator.items(20):
+            assert isinstance(expr, (sp.Le, sp.Lt))
+            assert expr.free_symbols <= set(generator.variables)
+            assert all(var.is_positive for var in expr.free_symbols)
+
+    def test_statements(self):
+        """Test that statements are universally quantified over the variables they mention."""
+        generator = InequalityGenerator(seed=2)
+        for stmt in generator.items(10, statements=True):
+            assert stmt.is_quantified()
+            assert stmt.type == "universal"
+            assert stmt.predicate.operator in [sp.Lt, sp.Le]
+
+    def test_pickle_stream_roundtrip(self, tmp_path):
+        """Test that written items are read back in order."""
+        items = list(generate(12, seed=1))
+        path = str(tmp_path / "items.pkl")
+        assert write_pickle_stream(iter(items), path) == 12
+        assert list(iter_pickle_stream(path)) == items
+
+    def test_invalid_knobs(self):
+        """Test that invalid knobs are rejected."""
+        with pytest.raises(ValueError, match="Number of variables must be a positive integer"):
+            InequalityGenerator(num_vars=0)
+        with pytest.raises(ValueError, match="Width must be an integer >= 2"):
+            InequalityGenerator(width=1)
+        with pytest.raises(ValueError, match="Fraction depth must be a non-negative integer"):
+            InequalityGenerator(fraction_depth=-1)
+        with pytest.raises(ValueError, match="Repeat rate must be between 0 and 1"):
+            InequalityGenerator(repeat_rate=1.5)
+
+
+if __name__ == "__main__":
+    # Run tests if this file is executed directly
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,77 @@
+import pytest
+import sympy as sp
+import sys
+import os
+
+# Add the parent directory to the path so we can import the modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from amgm import amgm
+from golden import ENGINES, canonical_candidates, golden_inputs, write_snapshot, read_snapshot, diff_engine
+
+
+class TestGolden:
+    """Test cases for the golden-output differential harness."""
+
+    def setup_method(self):
+        """Set up test fixtures before each test method."""
+        self.x, self.y, self.z = sp.symbols('x y z', positive=True)
+        self.inputs = [
+            ("manual", 0, sp.Le(self.x + self.y + self.z, self.x * self.y * self.z + 2)),
+            ("manual", 1, sp.Lt(self.x * self.y + 1, (self.x + self.y)**2)),
+            ("manual", 2, sp.Eq(self.x, self.y)),
+        ]
+
+    def test_canonical_candidates(self):
+        """Test that candidates are deduplicated and sorted in srepr form."""
+        x, y = self.x, self.y
+        candidate = [x + y, 2 * sp.sqrt(x * y), sp.Ge]
+        canonical = canonical_candidates([candidate, sp.Eq(x, y), list(candidate)])
+        assert len(canonical) == 2
+        assert canonical == sorted(canonical)
+        assert (sp.srepr(x + y), sp.srepr(2 * sp.sqrt(x * y)), "GreaterThan") in canonical
+
+    def test_snapshot_round_trip(self, tmp_path):
+        """Test that a snapshot stores the canonical amgm candidates of every input."""
+        path = str(tmp_path / "golden.jsonl")
+        assert write_snapshot(path, self.inputs) == 3
+        records = list(read_snapshot(path))
+        assert [(r["source"], r["index"]) for r in records] == [("manual", 0), ("manual", 1), ("manual", 2)]
+        for record, (_, _, expr) in zip(records, self.inputs):
+            assert sp.sympify(record["expr"]) == expr
+            assert [tuple(c) for c in record["candidates"]] == canonical_candidates(amgm(expr))
+
+    def test_golden_inputs(self):
+        """Test that level pickles are limited and generated inputs are tagged by seed."""
+        inputs = list(golden_inputs(levels=[1], limit=2, generated=2, seed=3))
+        assert [(source, index) for source, index, _ in inputs] == [
+            ("level1", 0), ("level1", 1), ("generated1:3", 0), ("generated1:3", 1)]
+
+    def test_engines_match_snapshot(self, tmp_path):
+        """Test that every registered engine reproduces the snapshot."""
+        path = str(tmp_path / "golden.jsonl")
+        write_snapshot(path, self.inputs)
+        for name, factory in ENGINES.items():
+            report = diff_engine(path, factory(), engine_name=name)
+            assert report.items == 3
+            assert report.equivalent, report.mismatches
+            assert report.engine_time > 0 and report.reference_time > 0
+
+    def test_faulty_engine(self, tmp_path):
+        """Test that a missing and an extra candidate are reported per item."""
+        path = str(tmp_path / "golden.jsonl")
+        write_snapshot(path, self.inputs[:2])
+        extra = [self.x, self.y, sp.Le]
+        report = diff_engine(path, lambda expr: amgm(expr)[1:] + [extra], reference=None, engine_name="faulty")
+        assert not report.equivalent
+        assert report.reference_time == 0
+        assert len(report.mismatches) == 2
+        source, index, missing, added = report.mismatches[0]
+        assert (source, index) == ("manual", 0)
+        assert len(missing) == 1
+        assert added == [(sp.srepr(self.x), sp.srepr(self.y), "LessThan")]
+
+
+if __name__ == "__main__":
+    # Run tests if this file is executed directly
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,166 @@
+import asyncio
+import json
+import pickle
+import pytest
+import sympy as sp
+import sys
+import os
+import time
+
+# Add the parent directory to the path so we can import the modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from amgm import amgm
+from service import RewriteService, expression_key, serialize_candidate, parse_srepr
+
+
+async def _collect(responses):
+    return [response async for response in responses]
+
+
+class TestRewriteService:
+    """Test cases for the asyncio rewrite service."""
+
+    def setup_method(self):
+        """Set up test fixtures before each test method."""
+        self.x, self.y, self.z = sp.symbols('x y z', positive=True)
+        self.expr = sp.Lt(self.x + self.y + self.z, self.x * self.y * self.z + 3)
+
+    def test_expression_key(self):
+        """Test that the key tells apart symbols that only differ in their assumptions."""
+        x = sp.Symbol('x')
+        assert expression_key(self.x + 1) == expression_key(sp.sympify(sp.srepr(self.x + 1)))
+        assert expression_key(self.x + 1) != expression_key(x + 1)
+
+    def test_candidates_and_coalescing(self):
+        """Test that concurrent identical requests share one computation of the amgm candidates."""
+
+        async def run():
+            async with RewriteService(processes=2) as service:
+                request = {"id": 1, "expr": sp.srepr(self.expr)}
+                first = await service.submit(request)
+                second = await service.submit(dict(request, id=2))
+                results = await asyncio.gather(_collect(first), _collect(second))
+                third = await _collect(await service.submit(dict(request, id=3)))
+                return results + [third], service.stats()
+
+        (first, second, third), stats = asyncio.run(run())
+        expected = {json.dumps(serialize_candidate(c)) for c in amgm(self.expr)}
+        assert {json.dumps(r["candidate"]) for r in first[:-1]} == expected
+        assert first[-1] == {"id": 1, "done": True, "count": len(expected), "source": "computed"}
+        assert second[-1]["source"] == "coalesced"
+        assert third[-1]["source"] == "cache"
+        assert [r["candidate"] for r in second[:-1]] == [r["candidate"] for r in first[:-1]]
+        assert stats["requests"] == 3
+        assert stats["computed"] == 1
+        assert stats["coalesced"] == 1
+        assert stats["cache_hits"] == 1
+        assert stats["p50_ms"] <= stats["p99_ms"]
+
+    def test_invalid_request(self):
+        """Test that an unparsable expression is answered with an error."""
+
+        async def run():
+            async with RewriteService() as service:
+                return await _collect(await service.submit({"id": "a", "expr": "Add(("}))
+
+        (response,) = asyncio.run(run())
+        assert response["id"] == "a"
+        assert response["error"].startswith("Invalid request")
+
+    def test_parse_srepr(self):
+        """Test that srepr strings round-trip without eval and anything else is rejected."""
+        x, y = self.x, self.y
+        for expr in [self.expr, sp.Le(sp.pi * x - sp.Float(1.5), sp.sqrt(2) / y), sp.Symbol('t', integer=True)]:
+            assert sp.srepr(parse_srepr(sp.srepr(expr))) == sp.srepr(expr)
+            assert pickle.loads(pickle.dumps(parse_srepr(sp.srepr(expr)))) == expr
+        for text in ['__import__("os").system("true")', 'sympify("x")', 'Symbol("x").__class__',
+                     'Integer(1) + Integer(2)', 'Symbol(**{"x": 1})', f'Integer({2**5000})',
+                     "Float('1.5', precision=1000000)", f"Symbol('{'x' * 2000}')"]:
+            with pytest.raises(ValueError, match="Disallowed"):
+                parse_srepr(text)
+
+        # Eagerly evaluating classes are built unevaluated
+        start = time.monotonic()
+        power = parse_srepr("Pow(Integer(7), Integer(3000000))")
+        factorial = parse_srepr("factorial(Integer(200000))")
+        assert time.monotonic() - start < 0.5
+        assert power.is_Pow and factorial.func == sp.factorial
+
+    def test_slow_parse_does_not_block(self, monkeypatch):
+        """Test that a request still being parsed does not hold up a concurrent one."""
+        slow_text = sp.srepr(self.expr)
+
+        def slow_parse(text):
+            if text == slow_text:
+                time.sleep(1)
+            return parse_srepr(text)
+
+        monkeypatch.setattr("service.parse_srepr", slow_parse)
+
+        async def run():
+            async with RewriteService() as service:
+                slow = asyncio.create_task(service.submit({"id": "slow", "expr": slow_text}))
+                await asyncio.sleep(0.1)
+                fast = await _collect(await service.submit({"id": "fast", "expr": "Add(("}))
+                slow_done = slow.done()
+                return fast, slow_done, await _collect(await slow)
+
+        (fast,), slow_done, slow = asyncio.run(run())
+        assert fast["error"].startswith("Invalid request")
+        assert not slow_done
+        assert slow[-1]["done"] and slow[-1]["count"] == len(amgm(self.expr))
+
+    def test_code_in_request_is_not_run(self, tmp_path):
+        """Test that a request trying to run code is rejected without running it."""
+        marker = tmp_path / "pwned"
+        code = f'__import__("os").system("touch {marker}")'
+
+        async def run():
+            async with RewriteService() as service:
+                return await _collect(await service.submit({"id": 1, "expr": code}))
+
+        (response,) = asyncio.run(run())
+        assert response["error"].startswith("Invalid request: ValueError: Disallowed")
+        assert not marker.exists()
+
+    def test_unix_socket(self, tmp_path):
+        """Test JSON-line requests and stats over a Unix socket."""
+        path = str(tmp_path / "amgm.sock")
+
+        async def run():
+            async with RewriteService() as service:
+                server = await asyncio.start_unix_server(service.serve_connection, path)
+                async with server:
+                    reader, writer = await asyncio.open_unix_connection(path)
+                    writer.write((json.dumps({"id": 7, "expr": sp.srepr(self.expr)}) + "\n").encode())
+                    writer.write(b"not json\n")
+                    responses = []
+                    while not responses or "done" not in responses[-1]:
+                        responses.append(json.loads(await reader.readline()))
+                    writer.write((json.dumps({"id": 8, "op": "stats"}) + "\n").encode())
+                    stats = json.loads(await reader.readline())
+                    writer.close()
+                    return responses, stats
+
+        responses, stats = asyncio.run(run())
+        assert {"id": None, "error": responses[0]["error"]} in responses
+        done = responses[-1]
+        assert done["id"] == 7
+        assert done["count"] == len([r for r in responses if "candidate" in r])
+        assert stats["id"] == 8
+        assert stats["stats"]["requests"] == 1
+
+    def test_invalid_arguments(self):
+        """Test that invalid service settings are rejected."""
+        with pytest.raises(ValueError, match="Processes must be a positive integer"):
+            RewriteService(processes=0)
+        with pytest.raises(ValueError, match="Max queue must be a positive integer"):
+            RewriteService(max_queue=0)
+        with pytest.raises(ValueError, match="Cache size must be a non-negative integer"):
+            RewriteService(cache_size=-1)
+
+
+if __name__ == "__main__":
+    # Run tests if this file is executed directly
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,90 @@
+import pytest
+import sympy as sp
+import sys
+import os
+
+# Add the parent directory to the path so we can import the modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from amgm import amgm
+from statement_rewrite import TreeRewriter, amgm_statement, inequality_leaves
+from relational import Relational
+from quantified import Quantified
+from logical import Logical
+
+
+class TestStatementRewrite:
+    """Test cases for applying amgm across the leaves of a statement tree."""
+
+    def setup_method(self):
+        """Set up test fixtures before each test method."""
+        self.x, self.y, self.z = sp.symbols('x y z', positive=True)
+
+        self.ineq = Relational(self.x + self.y, sp.Le, self.x * self.y + 1)
+        self.other = Relational(self.x + self.y + self.z, sp.Lt, self.x * self.y * self.z + 3)
+        self.equation = Relational(self.x, sp.Eq, self.y)
+        self.domain = Logical([self.equation, Relational(sp.Integer(0), sp.Lt, self.z)], "conjunction")
+        self.predicate = Logical([self.ineq, self.other, self.ineq], "disjunction")
+        self.quant = Quantified([self.x, self.y, self.z], self.domain, self.predicate, "universal")
+
+    def expected(self, rel):
+        """Candidates of amgm on a bare SymPy inequality, without the unchanged input."""
+        return {(l, r) for l, r, _ in amgm(rel.operator(rel.left, rel.right))[:-1]}
+
+    def test_inequality_leaves(self):
+        """Test that only Lt/Le leaves are found, with their paths."""
+        leaves = inequality_leaves(self.quant)
+        assert [path for path, _ in leaves] == [(0, 1), (1, 0), (1, 1), (1, 2)]
+
+    def test_candidates_match_amgm(self):
+        """Test that leaf candidates are Relationals matching amgm on the bare inequality."""
+        candidates = TreeRewriter().rewrite_leaves(self.quant)
+        for path, rel in [((1, 0), self.ineq), ((1, 1), self.other)]:
+            assert all(isinstance(c, Relational) and c.operator == rel.operator for c in candidates[path])
+            assert {(c.left, c.right) for c in candidates[path]} == self.expected(rel)
+        assert len(candidates[(1, 0)]) == 3
+        assert candidates[(0, 1)] == []
+
+    def test_shared_cache(self):
+        """Test that identical leaves are rewritten once and the cache is reused."""
+        cache = {}
+        rewriter = TreeRewriter(cache=cache)
+        rewriter.rewrite_leaves(self.quant)
+        assert set(cache) == {(self.ineq.left, self.ineq.right), (self.other.left, self.other.right),
+                              (sp.Integer(0), self.z)}
+
+        cache[(self.ineq.left, self.ineq.right)] = ((self.x,), ())
+        candidates = rewriter.rewrite_leaves(self.ineq)
+        assert [str(c) for c in candidates[()]] == ["x ≤ x*y + 1"]
+
+    def test_variants_copy_only_the_path(self):
+        """Test that variants share every subtree off the rewritten path."""
+        variants = amgm_statement(self.quant)
+        path, variant = next(variants)
+        assert path == (1, 0)
+        assert str(variant.predicate.elements[0]) == "2*sqrt(x)*sqrt(y) ≤ x*y + 1"
+
+        for path, variant in amgm_statement(self.quant):
+            if path == (1, 1):
+                assert variant.domain is self.domain
+                assert variant.predicate.elements[0] is self.ineq
+                assert variant.predicate.elements[2] is self.ineq
+                assert variant.predicate.elements[1] is not self.other
+
+    def test_parallel_matches_serial(self):
+        """Test that rewriting on a process pool gives the same candidates."""
+        serial = TreeRewriter().rewrite_leaves(self.quant)
+        parallel = TreeRewriter(processes=2).rewrite_leaves(self.quant)
+        assert serial.keys() == parallel.keys()
+        for path in serial:
+            assert {str(c) for c in serial[path]} == {str(c) for c in parallel[path]}
+
+    def test_invalid_processes(self):
+        """Test that an invalid process count is rejected."""
+        with pytest.raises(ValueError, match="Processes must be a positive integer"):
+            TreeRewriter(processes=0)
+
+
+if __name__ == "__main__":
+    # Run tests if this file is executed directly
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,97 @@
+import itertools
+import time
+import pytest
+import sympy as sp
+import sys
+import os
+
+# Add the parent directory to the path so we can import the modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from amgm import amgm
+from symmetry import (symmetry_group, canonical_candidate, child_orbit_representatives, comb_orbit_representatives,
+                      symmetric_amgm)
+from amgm import _partitions
+
+
+class TestSymmetry:
+    """Test cases for symmetry reduction of amgm candidates."""
+
+    def setup_method(self):
+        """Set up test fixtures before each test method."""
+        self.x, self.y, self.z, self.w = sp.symbols('x y z w', positive=True)
+
+    def test_symmetry_group(self):
+        """Test detection of full, cyclic and trivial symmetry."""
+        x, y, z = self.x, self.y, self.z
+        assert len(symmetry_group(sp.Le(x + y + z, x * y * z + 2))) == 6
+        assert len(symmetry_group(sp.Le(x / y + y / z + z / x, x + y + z))) == 3
+        group = symmetry_group(sp.Le(x + 2 * y, z))
+        assert group == [{x: x, y: y, z: z}]
+
+    def test_symmetry_group_by_generators(self):
+        """Test that the closure of generators finds the cyclic group of many symbols."""
+        v = sp.symbols('a0:7', positive=True)
+        cyclic = sp.Le(sum(v[i] / v[(i + 1) % 7] for i in range(7)), 7 * sum(v))
+        assert len(symmetry_group(cyclic)) == 7
+
+    def test_canonical_candidate(self):
+        """Test that candidates in the same orbit share one canonical form."""
+        x, y, z = self.x, self.y, self.z
+        group = symmetry_group(sp.Le(x + y + z, x * y * z + 2))
+        first = canonical_candidate([2 * sp.sqrt(x * y) + z, x * y * z + 2, sp.Le], group)
+        second = canonical_candidate([2 * sp.sqrt(y * z) + x, x * y * z + 2, sp.Le], group)
+        assert first == second
+
+    def test_child_orbit_representatives(self):
+        """Test that one child is kept per orbit of the top-level children."""
+        x, y, z = self.x, self.y, self.z
+        side = x / (y + z) + y / (z + x) + z / (x + y) + 1
+        group = symmetry_group(sp.Le(side, x + y + z))
+        representatives = child_orbit_representatives(side, group)
+        assert len(representatives) == 2
+
+    def test_one_representative_per_orbit(self):
+        """Test that symmetric_amgm yields exactly the orbits of the amgm candidates."""
+        x, y, z, w = self.x, self.y, self.z, self.w
+        for expr in [
+            sp.Le(x / (y + z) + y / (z + x) + z / (x + y), (x**2 + y**2 + z**2) / (x * y + y * z + z * x) + 1),
+            sp.Lt(x * y + y * z + z * w + w * x, (x + y + z + w)**2),
+            sp.Le(x + 2 * y, z * w + 1),
+            sp.Le(x + y + z + w, x * y * z * w + 4),
+        ]:
+            group = symmetry_group(expr)
+            candidates = symmetric_amgm(expr)
+            expected = {tuple(canonical_candidate(c, group)) for c in amgm(expr)}
+            assert {tuple(canonical_candidate(c, group)) for c in candidates} == expected
+            assert len(candidates) == len(expected)
+            assert candidates[-1] == [expr.lhs, expr.rhs, type(expr)]
+
+    def test_comb_orbit_representatives(self):
+        """Test that combs are reduced to one per orbit under the term permutations."""
+        combs = _partitions(4)
+        assert comb_orbit_representatives(combs, [(0, 1, 2, 3)]) == combs
+        everything = set(itertools.permutations(range(4)))
+        # Shapes of at least two groups plus a remainder, for four interchangeable terms
+        assert len(comb_orbit_representatives(combs, everything)) == 7
+
+    def test_fully_symmetric_volume(self):
+        """Test that six interchangeable variables give one candidate per orbit, fast (plain amgm gives 2440)."""
+        v = sp.symbols('a0:6', positive=True)
+        expr = sp.Le(sum(v), sp.Mul(*v) + 6)
+        start = time.monotonic()
+        candidates = symmetric_amgm(expr)
+        elapsed = time.monotonic() - start
+        # One AM-GM rewrite per comb shape on the left, 46 rewrites on the right and the inequality
+        assert len(candidates) == 23 + 46 + 1
+        assert elapsed < 5
+
+    def test_non_inequality(self):
+        """Test that anything but an inequality is returned unchanged."""
+        expr = sp.Eq(self.x, self.y)
+        assert symmetric_amgm(expr) == [expr]
+
+
+if __name__ == "__main__":
+    # Run tests if this file is executed directly
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,99 @@
+import threading
+import time
+import pytest
+import sympy as sp
+import sys
+import os
+
+# Add the parent directory to the path so we can import the modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from amgm import amgm
+from verify import (CandidateVerifier, check_candidate, verify_candidates, STRATEGIES,
+                    VERIFIED, REFUTED, UNDECIDED, TIMEOUT, CANCELLED, CRASHED)
+
+
+def _slow(diff):
+    time.sleep(30)
+    return diff
+
+
+def _crash_on_two(diff):
+    if diff == 2:
+        os._exit(1)
+    return diff
+
+
+class TestVerify:
+    """Test cases for parallel candidate verification."""
+
+    def setup_method(self):
+        """Set up test fixtures before each test method."""
+        self.x, self.y = sp.symbols('x y', positive=True)
+
+    def test_graded_strategies(self):
+        """Test that the cheapest strategy able to decide a candidate is reported."""
+        x, y = self.x, self.y
+        assert check_candidate([x, x + 1, sp.Lt]) == (VERIFIED, "direct")
+        assert check_candidate([x + 1, x, sp.Le]) == (REFUTED, "direct")
+        assert check_candidate([(x + y)**2, x**2 + y**2, sp.Ge]) == (VERIFIED, "expand")
+        assert check_candidate([x + y, 2 * sp.sqrt(x * y), sp.Ge]) == (UNDECIDED, None)
+        assert check_candidate(sp.Eq(x, y)) == (UNDECIDED, None)
+
+    def test_verify_all_candidates(self):
+        """Test that every candidate gets exactly one verdict, matching check_candidate."""
+        x, y = self.x, self.y
+        candidates = amgm(sp.Le(x + y, x * y + 1))
+        verdicts = verify_candidates(candidates, processes=2)
+        assert [v.index for v in verdicts] == list(range(len(candidates)))
+        for verdict, candidate in zip(verdicts, candidates):
+            assert verdict.candidate == candidate
+            assert (verdict.status, verdict.strategy) == check_candidate(candidate)
+
+    def test_timeout(self):
+        """Test that a runaway check is killed and the remaining candidates still finish."""
+        x = self.x
+        verifier = CandidateVerifier(processes=1, timeout=0.5, strategies=[("slow", _slow)] + STRATEGIES)
+        start = time.monotonic()
+        verdicts = list(verifier.verify([[x, x + 1, sp.Lt], [x, x + 2, sp.Lt]]))
+        assert time.monotonic() - start < 10
+        assert [v.status for v in verdicts] == [TIMEOUT, TIMEOUT]
+
+    def test_crashed_worker(self):
+        """Test that a worker dying mid-check is replaced and the other candidates still finish."""
+        x = self.x
+        verifier = CandidateVerifier(processes=1, timeout=60, strategies=[("crash", _crash_on_two)])
+        verdicts = list(verifier.verify([[x, x + 1, sp.Lt], [x, x + 2, sp.Lt], [x, x + 3, sp.Lt]]))
+        assert [(v.index, v.status) for v in verdicts] == [(0, VERIFIED), (1, CRASHED), (2, VERIFIED)]
+
+    def test_cancel(self):
+        """Test that cancelling marks in-flight candidates and stops consuming the input."""
+        x = self.x
+        verifier = CandidateVerifier(processes=2, timeout=60, strategies=[("slow", _slow)])
+        consumed = []
+
+        def candidates():
+            for i in range(100):
+                consumed.append(i)
+                yield [x, x + i, sp.Le]
+
+        timer = threading.Timer(0.5, verifier.cancel)
+        timer.start()
+        start = time.monotonic()
+        verdicts = list(verifier.verify(candidates()))
+        timer.join()
+        assert time.monotonic() - start < 10
+        assert [v.status for v in verdicts] == [CANCELLED, CANCELLED]
+        assert len(consumed) == 2
+
+    def test_invalid_arguments(self):
+        """Test that invalid verifier arguments are rejected."""
+        with pytest.raises(ValueError, match="Processes must be a positive integer"):
+            CandidateVerifier(processes=0)
+        with pytest.raises(ValueError, match="Timeout must be a positive number"):
+            CandidateVerifier(timeout=0)
+
+
+if __name__ == "__main__":
+    # Run tests if this file is executed directly
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,86 @@
+import pickle
+import pytest
+import sys
+import os
+
+# Add the parent directory to the path so we can import the modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import worker
+from worker import BatchWorker, iter_dataset
+from generate_dataset import generate, write_pickle_stream
+
+
+class TestBatchWorker:
+    """Test cases for the memory-bounded batch worker."""
+
+    def setup_method(self):
+        """Set up test fixtures before each test method."""
+        self.items = list(generate(6, seed=0, fraction_depth=0))
+
+    def test_reports_per_level(self):
+        """Test that every item is reported under its level with memory statistics."""
+        seen = []
+        reports = BatchWorker(processes=2, max_items_per_worker=2).run(
+            {"a": self.items[:4], "b": self.items[4:]}, on_item=seen.append)
+
+        assert reports["a"].items == 4
+        assert reports["b"].items == 2
+        assert len(seen) == 6
+        assert reports["a"].peak_rss > 0
+        assert reports["a"].candidates == sum(r["candidates"] for r in seen if r["level"] == "a")
+        assert reports["a"].cache_clears == 0
+
+    def test_bounded_tasks_in_flight(self, monkeypatch):
+        """Test that items are read lazily, keeping a bounded number of tasks submitted."""
+        monkeypatch.setattr(BatchWorker, "IN_FLIGHT_PER_PROCESS", 2)
+        pulled = []
+
+        def items():
+            for i, expr in enumerate(self.items):
+                pulled.append(i)
+                yield expr
+
+        pulled_at_report = []
+        reports = BatchWorker().run({"a": items()}, on_item=lambda report: pulled_at_report.append(len(pulled)))
+        assert reports["a"].items == len(self.items)
+        # Each report refills one task before on_item runs
+        assert pulled_at_report == [min(n + 3, len(self.items)) for n in range(len(self.items))]
+
+    def test_budget_triggers_cache_clears(self):
+        """Test that crossing the memory budget clears the caches after the item."""
+        reports = BatchWorker(memory_budget_mb=1).run({"a": self.items})
+        assert 1 <= reports["a"].cache_clears <= len(self.items)
+
+    def test_clears_at_new_high_water_marks(self, monkeypatch):
+        """Test that the caches are cleared again only when RSS grows past the last clear."""
+        rss = iter([50, 120, 110, 120, 130, 90, 125, 140])
+        monkeypatch.setattr(worker, "current_rss", lambda: next(rss))
+        worker._init_worker(100)
+        cleared = [worker._process_item(("a", i, expr))["cleared"] for i, expr in enumerate(self.items + self.items[:2])]
+        assert cleared == [False, True, False, False, True, False, False, True]
+
+    def test_iter_dataset(self, tmp_path):
+        """Test that level pickles and pickle streams are both read."""
+        level_path = str(tmp_path / "level.pkl")
+        with open(level_path, "wb") as f:
+            pickle.dump(self.items, f)
+        stream_path = str(tmp_path / "stream.pkl")
+        write_pickle_stream(self.items, stream_path)
+
+        assert list(iter_dataset(level_path)) == self.items
+        assert list(iter_dataset(stream_path)) == self.items
+
+    def test_invalid_arguments(self):
+        """Test that invalid worker settings are rejected."""
+        with pytest.raises(ValueError, match="Processes must be a positive integer"):
+            BatchWorker(processes=0)
+        with pytest.raises(ValueError, match="Memory budget must be positive"):
+            BatchWorker(memory_budget_mb=0)
+        with pytest.raises(ValueError, match="Max items per worker must be a positive integer"):
+            BatchWorker(max_items_per_worker=0)
+
+
+if __name__ == "__main__":
+    # Run tests if this file is executed directly
+    pytest.main([__file__, "-v"])
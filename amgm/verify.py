@@ -0,0 +1,228 @@
+import argparse
+import collections
+import multiprocessing
+import os
+import time
+import sympy as sp
+from multiprocessing.connection import wait
+
+from amgm import amgm
+from worker import iter_dataset
+
+# Verdict statuses
+VERIFIED = "verified"  # the candidate inequality holds for all positive values of its symbols
+REFUTED = "refuted"  # it fails for all of them
+UNDECIDED = "undecided"  # no strategy could decide it
+TIMEOUT = "timeout"  # its check was killed after the per-candidate timeout
+CANCELLED = "cancelled"  # cancel() was called before its check finished
+CRASHED = "crashed"  # its worker process died while checking it (e.g. killed for running out of memory)
+
+def _unchanged(diff):
+    return diff
+
+
+# Graded strategies, cheapest first: each is applied to the difference that must be positive.
+# They are sent to the worker processes, so they must be picklable
+STRATEGIES = [
+    ("direct", _unchanged),
+    ("expand", sp.expand),
+    ("cancel", sp.cancel),
+    ("simplify", sp.simplify),
+]
+
+
+class Verdict(collections.namedtuple("Verdict", ["index", "candidate", "status", "strategy", "elapsed"])):
+    """
+    Outcome of checking the candidate at position index of the input.
+
+    strategy names the strategy that decided the candidate (None unless status is VERIFIED
+    or REFUTED) and elapsed is the wall time in seconds spent on it.
+    """
+
+    __slots__ = ()
+
+
+def check_candidate(candidate, strategies=None):
+    """
+    Decide one [lhs, rhs, rel] candidate in the current process.
+
+    Returns a (status, strategy) pair. The strategies are tried in order on rhs - lhs for
+    sp.Lt and sp.Le (lhs - rhs for sp.Gt and sp.Ge) until one of them tells the sign of it.
+    """
+    if strategies is None:
+        strategies = STRATEGIES
+    if not isinstance(candidate, (list, tuple)) or len(candidate) != 3:
+        return UNDECIDED, None
+
+    lhs, rhs, rel = candidate
+    if rel == sp.Lt or rel == sp.Le: diff = rhs - lhs
+    elif rel == sp.Gt or rel == sp.Ge: diff = lhs - rhs
+    else: return UNDECIDED, None
+    strict = rel == sp.Lt or rel == sp.Gt
+
+    for name, strategy in strategies:
+        reduced = strategy(diff)
+        holds = reduced.is_positive if strict else reduced.is_nonnegative
+        if holds is not None:
+            return (VERIFIED if holds else REFUTED), name
+    return UNDECIDED, None
+
+
+def _verify_worker(conn, strategies):
+    # Checks one candidate per message until it receives None
+    while True:
+        task = conn.recv()
+        if task is None:
+            break
+        index, candidate = task
+        status, strategy = check_candidate(candidate, strategies)
+        conn.send((index, status, strategy))
+
+
+class _Slot:
+    """One worker process with the candidate it is currently checking."""
+
+    def __init__(self, context, strategies):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_verify_worker, args=(child_conn, strategies), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.task = None
+        self.started = None
+
+    def submit(self, index, candidate):
+        self.task = (index, candidate)
+        self.started = time.monotonic()
+        self.conn.send(self.task)
+
+    def kill(self):
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+    def close(self):
+        try:
+            self.conn.send(None)
+        except (BrokenPipeError, OSError):
+            pass
+        self.process.join(1)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.conn.close()
+
+
+class CandidateVerifier:
+    """
+    Check amgm candidates on a pool of worker processes with a hard per-candidate timeout.
+
+    Each worker checks one candidate at a time with the graded strategies of
+    check_candidate. A worker still busy timeout seconds after it received a candidate is
+    killed and replaced, and that candidate gets a TIMEOUT verdict; a worker that dies while
+    checking a candidate is replaced as well, and the candidate gets a CRASHED verdict.
+    verify() yields verdicts
+    as they finish, not in input order. cancel() stops dispatching and kills busy workers;
+    the candidates they were checking get a CANCELLED verdict and the remaining input is
+    left unconsumed.
+    """
+
+    # Longest wait for a result before checking for timeouts and cancel() again
+    POLL_INTERVAL = 0.1
+
+    def __init__(self, processes=1, timeout=10.0, strategies=None):
+        if not isinstance(processes, int) or processes < 1:
+            raise ValueError(f"Processes must be a positive integer, got {processes} (type: {type(processes)})")
+        if not isinstance(timeout, (int, float)) or timeout <= 0:
+            raise ValueError(f"Timeout must be a positive number, got {timeout} (type: {type(timeout)})")
+
+        self.processes = processes
+        self.timeout = timeout
+        self.strategies = STRATEGIES if strategies is None else strategies
+        self._cancelled = False
+
+    def cancel(self):
+        """Stop verify() early; it may be called from another thread or from a verdict loop."""
+        self._cancelled = True
+
+    def verify(self, candidates):
+        """Yield a Verdict for every candidate of the iterable candidates as it is decided."""
+        context = multiprocessing.get_context()
+        pending = enumerate(candidates)
+        slots = [_Slot(context, self.strategies) for _ in range(self.processes)]
+        try:
+            while True:
+                if not self._cancelled:
+                    for slot in slots:
+                        if slot.task is None:
+                            task = next(pending, None)
+                            if task is None:
+                                break
+                            slot.submit(*task)
+
+                busy = [slot for slot in slots if slot.task is not None]
+                if not busy:
+                    break
+
+                if self._cancelled:
+                    # Busy workers are killed on the way out
+                    for slot in busy:
+                        index, candidate = slot.task
+                        yield Verdict(index, candidate, CANCELLED, None, time.monotonic() - slot.started)
+                    break
+
+                now = time.monotonic()
+                deadline = min(slot.started for slot in busy) + self.timeout
+                ready = wait([slot.conn for slot in busy], min(max(deadline - now, 0), self.POLL_INTERVAL))
+                now = time.monotonic()
+
+                for i, slot in enumerate(slots):
+                    if slot.task is None:
+                        continue
+                    index, candidate = slot.task
+                    if slot.conn in ready:
+                        try:
+                            _, status, strategy = slot.conn.recv()
+                        except (EOFError, OSError):
+                            # The worker died; a closed pipe is reported as ready
+                            slot.kill()
+                            slots[i] = _Slot(context, self.strategies)
+                            yield Verdict(index, candidate, CRASHED, None, now - slot.started)
+                            continue
+                        slot.task = None
+                        yield Verdict(index, candidate, status, strategy, now - slot.started)
+                    elif now - slot.started >= self.timeout:
+                        slot.kill()
+                        slots[i] = _Slot(context, self.strategies)
+                        yield Verdict(index, candidate, TIMEOUT, None, now - slot.started)
+        finally:
+            self._cancelled = False
+            for slot in slots:
+                if slot.task is None:
+                    slot.close()
+                else:
+                    slot.kill()
+
+
+def verify_candidates(candidates, processes=1, timeout=10.0):
+    """Return the verdicts of all candidates in input order; see CandidateVerifier."""
+    verdicts = list(CandidateVerifier(processes, timeout).verify(candidates))
+    return sorted(verdicts, key=lambda verdict: verdict.index)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Verify the amgm candidates of a dataset in parallel.")
+    parser.add_argument("dataset", help="level pickle or pickle stream")
+    parser.add_argument("--processes", type=int, default=os.cpu_count())
+    parser.add_argument("--timeout", type=float, default=10.0)
+    args = parser.parse_args(argv)
+
+    verifier = CandidateVerifier(args.processes, args.timeout)
+    candidates = (candidate for expr in iter_dataset(args.dataset) for candidate in amgm(expr))
+    counts = collections.Counter()
+    for verdict in verifier.verify(candidates):
+        counts[verdict.status] += 1
+    print(dict(counts))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+import argparse
+import itertools
+import multiprocessing
+import os
+import queue
+import resource
+import sympy as sp
+from sympy.core import cache as sympy_cache
+
+from amgm import amgm, clear_caches
+from dataset_store import DatasetStore, is_store, iter_pickles
+
+
+def current_rss():
+    """Return the resident set size of this process in bytes."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        # No /proc (e.g. macOS): fall back to the high-water mark, reported in bytes there
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def sympy_cache_size():
+    """Return the number of entries held by SymPy's global caches."""
+    return sum(f.cache_info().currsize for f in sympy_cache.CACHE if hasattr(f, "cache_info"))
+
+
+def iter_dataset(path):
+    """Yield the expressions of a dataset store, a level pickle (one list) or a pickle stream."""
+    if is_store(path):
+        yield from DatasetStore(path)
+    else:
+        yield from iter_pickles(path)
+
+
+class LevelReport:
+    """Memory statistics of the items of one dataset level."""
+
+    def __init__(self, level):
+        self.level = level
+        self.items = 0
+        self.candidates = 0
+        self.peak_rss = 0
+        self.peak_sympy_cache = 0
+        self.peak_memo = 0
+        self.cache_clears = 0
+
+    def add(self, report):
+        self.items += 1
+        self.candidates += report["candidates"]
+        self.peak_rss = max(self.peak_rss, report["rss"])
+        self.peak_sympy_cache = max(self.peak_sympy_cache, report["sympy_cache"])
+        self.peak_memo = max(self.peak_memo, report["memo"])
+        self.cache_clears += report["cleared"]
+
+    def __repr__(self):
+        return (f"LevelReport({self.level}: items={self.items}, candidates={self.candidates}, "
+                f"peak_rss={self.peak_rss / 2**20:.1f} MiB, peak_sympy_cache={self.peak_sympy_cache}, "
+                f"peak_memo={self.peak_memo}, cache_clears={self.cache_clears})")
+
+
+# State of a pool worker process, set up by _init_worker
+_memo = None
+_budget = None
+# RSS that triggered the last cache clear; freed memory is rarely returned to the OS, so the
+# caches are only cleared again once RSS grows past it
+_clear_mark = 0
+
+
+def _init_worker(budget):
+    global _memo, _budget, _clear_mark
+    _memo = {}
+    _budget = budget
+    _clear_mark = 0
+
+
+def _process_item(task):
+    global _clear_mark
+    level, index, expr = task
+    if isinstance(expr, DatasetStore):
+        # Only the store's path was sent; decode the item from this worker's mapping
+        expr = expr[index]
+    candidates = amgm(expr, _memo)
+
+    report = {"level": level, "index": index, "candidates": len(candidates),
+              "rss": current_rss(), "sympy_cache": sympy_cache_size(), "memo": len(_memo), "cleared": False}
+    del candidates
+    if _budget is not None and report["rss"] > max(_budget, _clear_mark):
+        _clear_mark = report["rss"]
+        sp.core.cache.clear_cache()
+        clear_caches()
+        _memo.clear()
+        report["cleared"] = True
+    return report
+
+
+class BatchWorker:
+    """
+    Run amgm over large batches with bounded memory.
+
+    Items are processed on a pool of processes, each keeping an amgm_expr memo table
+    across items. After every item, a worker whose RSS exceeds memory_budget_mb clears
+    SymPy's global cache, amgm's comb lists and its memo table. Since the freed memory mostly
+    stays with the process, it clears again only once RSS grows past the RSS of its last
+    clear, so the memo keeps being reused in between. Each worker process is replaced by a
+    fresh one after max_items_per_worker items, returning everything it accumulated to
+    the OS. run() reports per-level memory high-water marks.
+    """
+
+    # Tasks kept submitted per process; a new one is submitted as each report arrives
+    IN_FLIGHT_PER_PROCESS = 32
+
+    def __init__(self, processes=1, memory_budget_mb=None, max_items_per_worker=None):
+        if not isinstance(processes, int) or processes < 1:
+            raise ValueError(f"Processes must be a positive integer, got {processes} (type: {type(processes)})")
+        if memory_budget_mb is not None and memory_budget_mb <= 0:
+            raise ValueError(f"Memory budget must be positive, got {memory_budget_mb} (type: {type(memory_budget_mb)})")
+        if max_items_per_worker is not None and (not isinstance(max_items_per_worker, int) or max_items_per_worker < 1):
+            raise ValueError(f"Max items per worker must be a positive integer, got {max_items_per_worker} (type: {type(max_items_per_worker)})")
+
+        self.processes = processes
+        self.memory_budget_mb = memory_budget_mb
+        self.max_items_per_worker = max_items_per_worker
+
+    @staticmethod
+    def _tasks(level, items):
+        if isinstance(items, DatasetStore):
+            return ((level, index, items) for index in range(len(items)))
+        return ((level, index, expr) for index, expr in enumerate(items))
+
+    def run(self, datasets, on_item=None):
+        """
+        Process datasets, a dict mapping a level name to an iterable of expressions or a
+        DatasetStore; items of a store are decoded by the workers themselves.
+
+        on_item, if given, is called with each item's report dict as it completes, in
+        completion order. Returns a dict mapping each level name to its LevelReport.
+        """
+        reports = {level: LevelReport(level) for level in datasets}
+        tasks = itertools.chain.from_iterable(self._tasks(level, items) for level, items in datasets.items())
+        budget = None if self.memory_budget_mb is None else self.memory_budget_mb * 2**20
+
+        with multiprocessing.Pool(self.processes, initializer=_init_worker, initargs=(budget,),
+                                  maxtasksperchild=self.max_items_per_worker) as pool:
+            # Pool.imap drains its whole input up front, so tasks are submitted one at a time,
+            # refilling as reports arrive: the input is read lazily and no process waits for the
+            # slowest item of a window before getting more work
+            done = queue.SimpleQueue()
+
+            def submit(task):
+                pool.apply_async(_process_item, (task,), callback=done.put, error_callback=done.put)
+
+            in_flight = 0
+            for task in itertools.islice(tasks, self.processes * self.IN_FLIGHT_PER_PROCESS):
+                submit(task)
+                in_flight += 1
+            while in_flight:
+                report = done.get()
+                in_flight -= 1
+                if isinstance(report, BaseException):
+                    raise report
+                for task in itertools.islice(tasks, 1):
+                    submit(task)
+                    in_flight += 1
+                reports[report["level"]].add(report)
+                if on_item is not None:
+                    on_item(report)
+        return reports
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run amgm over datasets with a bounded memory footprint.")
+    parser.add_argument("datasets", nargs="+", help="dataset stores, level pickles or pickle streams")
+    parser.add_argument("--processes", type=int, default=1)
+    parser.add_argument("--memory-budget-mb", type=float)
+    parser.add_argument("--max-items-per-worker", type=int)
+    args = parser.parse_args(argv)
+
+    worker = BatchWorker(args.processes, args.memory_budget_mb, args.max_items_per_worker)
+    datasets = {os.path.splitext(os.path.basename(path))[0]: DatasetStore(path) if is_store(path) else iter_dataset(path)
+                for path in args.datasets}
+    for report in worker.run(datasets).values():
+        print(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+import sympy as sp
+import sys
+import os
+import time
+
+# Add the parent directory to the path so we can import the modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from relational import Relational
+from logical import Logical
+from traversal import preorder
+
+
+def build_tree(width, depth):
+    """Build a tree of nested conjunctions with width Relational leaves per level."""
+    x = sp.Symbol('x')
+    stmt = Relational(x, sp.Lt, sp.Integer(0))
+    for level in range(depth):
+        leaves = [Relational(x, sp.Lt, sp.Integer(i + level)) for i in range(width)]
+        stmt = Logical(leaves + [stmt], "conjunction")
+    return stmt
+
+
+def import_dispatch(node):
+    """The previous per-call import and isinstance checks, for comparison."""
+    from relational import Relational
+    from quantified import Quantified
+    from logical import Logical
+    return isinstance(node, Relational), isinstance(node, Quantified), isinstance(node, Logical)
+
+
+def kind_dispatch(node):
+    return node.is_relational(), node.is_quantified(), node.is_logical()
+
+
+def bench(function, nodes, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for node in nodes:
+            function(node)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+if __name__ == "__main__":
+    nodes = list(preorder(build_tree(width=50, depth=2000)))
+    old = bench(import_dispatch, nodes, repeat=5)
+    new = bench(kind_dispatch, nodes, repeat=5)
+    print(f"{len(nodes)} nodes")
+    print(f"import + isinstance: {old * 1e9 / len(nodes):.1f} ns/node")
+    print(f"kind attribute:      {new * 1e9 / len(nodes):.1f} ns/node ({old / new:.1f}x faster)")
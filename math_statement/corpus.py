@@ -0,0 +1,131 @@
+from math_statement import MathStatement, RELATIONAL, LOGICAL
+from traversal import preorder
+
+
+class StatementCorpus:
+    """
+    A collection of MathStatements with inverted indexes for fast lookup.
+
+    Each statement gets an integer ID on insertion and is indexed by the symbols it mentions,
+    the relational operators and logical connectives it uses, the kinds of node it contains
+    (StatementKind members, which compare equal to their string values) and the quantifier
+    types it contains. Indexes are updated incrementally on add/remove.
+    Statements are indexed as they are at insertion time; re-add a statement after mutating it.
+    """
+
+    INDEX_FIELDS = ["symbols", "operators", "connectives", "kinds", "quantifiers"]
+
+    def __init__(self, statements=()):
+        self._statements = {}
+        self._features = {}
+        self._indexes = {field: {} for field in self.INDEX_FIELDS}
+        self._next_id = 0
+
+        for statement in statements:
+            self.add(statement)
+
+    def _validate_statement(self, value):
+        """Validate that value is a MathStatement instance."""
+        if not isinstance(value, MathStatement):
+            raise TypeError(f"Statement must be a MathStatement instance, got {value} (type: {type(value)})")
+
+    def _validate_id(self, value):
+        """Validate that value is the ID of a statement in the corpus."""
+        if value not in self._statements:
+            raise KeyError(f"No statement with ID {value} in the corpus")
+
+    def _extract_features(self, statement):
+        """Collect the index keys of every node in statement in a single pass."""
+        features = {field: set() for field in self.INDEX_FIELDS}
+        for node in preorder(statement):
+            kind = node.kind
+            features["kinds"].add(kind)
+            if kind is RELATIONAL:
+                features["operators"].add(node.operator)
+                for side in node.sides:
+                    features["symbols"].update(side.free_symbols)
+            elif kind is LOGICAL:
+                features["connectives"].add(node.type)
+            else:
+                features["quantifiers"].add(node.type)
+                features["symbols"].update(node.variables)
+        return features
+
+    def add(self, statement):
+        """Insert statement into the corpus and return its ID."""
+        self._validate_statement(statement)
+        statement_id = self._next_id
+        self._next_id += 1
+
+        features = self._extract_features(statement)
+        for field, keys in features.items():
+            index = self._indexes[field]
+            for key in keys:
+                index.setdefault(key, set()).add(statement_id)
+
+        self._statements[statement_id] = statement
+        self._features[statement_id] = features
+        return statement_id
+
+    def remove(self, statement_id):
+        """Remove the statement with the given ID and return it."""
+        self._validate_id(statement_id)
+        for field, keys in self._features.pop(statement_id).items():
+            index = self._indexes[field]
+            for key in keys:
+                ids = index[key]
+                ids.discard(statement_id)
+                if not ids:
+                    del index[key]
+        return self._statements.pop(statement_id)
+
+    def query(self, symbols=(), operators=(), connectives=(), kinds=(), quantifiers=()):
+        """
+        Return the IDs of statements matching every given key (conjunctive query).
+
+        For example query(symbols=[x], operators=[sp.Lt], quantifiers=["existential"]) returns the
+        statements that mention x, use sp.Lt and contain an existential quantifier. With no keys,
+        all IDs are returned.
+        """
+        postings = []
+        for field, keys in zip(self.INDEX_FIELDS, (symbols, operators, connectives, kinds, quantifiers)):
+            index = self._indexes[field]
+            for key in keys:
+                ids = index.get(key)
+                if not ids:
+                    return set()
+                postings.append(ids)
+
+        if not postings:
+            return set(self._statements)
+
+        # Intersect starting from the rarest key so intermediate sets stay small
+        postings.sort(key=len)
+        result = set(postings[0])
+        for ids in postings[1:]:
+            result &= ids
+            if not result:
+                break
+        return result
+
+    def keys(self, field):
+        """Return the indexed keys of field, e.g. keys("symbols")."""
+        if field not in self._indexes:
+            raise ValueError(f"Field must be one of {self.INDEX_FIELDS}, got {field} (type: {type(field)})")
+        return set(self._indexes[field])
+
+    def __getitem__(self, statement_id):
+        self._validate_id(statement_id)
+        return self._statements[statement_id]
+
+    def __contains__(self, statement_id):
+        return statement_id in self._statements
+
+    def __iter__(self):
+        return iter(self._statements)
+
+    def __len__(self):
+        return len(self._statements)
+
+    def __repr__(self):
+        return f"StatementCorpus({len(self)} statements)"
@@ -0,0 +1,132 @@
+import sympy as sp
+from math_statement import MathStatement
+from logical import Logical
+from traversal import children
+
+
+class Instantiator:
+    """
+    Batch instantiation of a Quantified statement.
+
+    A substitution plan is computed once per node and scope: the set of bound variables that
+    occur free in it, and for Relational nodes which sides mention them. Every binding in a
+    batch reuses these plans, so nodes that no bound variable reaches are shared untouched,
+    touched sides are rewritten with a single xreplace, and rebuilt nodes skip re-validation.
+    Variables re-bound by a nested Quantified are not substituted inside it. A fully bound
+    universal statement becomes domain → predicate, a fully bound existential domain ∧ predicate.
+    """
+
+    def __init__(self, statement):
+        if not isinstance(statement, MathStatement) or not statement.is_quantified():
+            raise TypeError(f"Statement must be a Quantified instance, got {statement} (type: {type(statement)})")
+
+        self._statement = statement
+        self._variables = statement.variables
+        self._plans = {}
+        self._side_plans = {}
+
+    def _validate_binding(self, binding):
+        """Validate a binding and return it with sympified values."""
+        if not isinstance(binding, dict):
+            raise TypeError(f"Binding must be a dict, got {binding} (type: {type(binding)})")
+
+        validated = {}
+        for var, value in binding.items():
+            if var not in self._variables:
+                raise ValueError(f"Binding variable must be one of {self._variables}, got {var} (type: {type(var)})")
+            value = sp.sympify(value)
+            if value.free_symbols:
+                raise ValueError(f"Binding value for {var} must be a closed SymPy expression, got {value}")
+            validated[var] = value
+        return validated
+
+    def _inner_scope(self, node, scope):
+        """Return the bound variables still visible inside node."""
+        if node.is_quantified():
+            return scope.difference(node.variables)
+        return scope
+
+    def _plan(self, root, scope):
+        """Compute the substitution plans of every node under root for the given scope."""
+        stack = [(root, scope, False)]
+        while stack:
+            node, node_scope, expanded = stack.pop()
+            key = (id(node), node_scope)
+            if key in self._plans:
+                continue
+
+            if node.is_relational():
+                left = bool(node_scope & node.left.free_symbols)
+                right = bool(node_scope & node.right.free_symbols)
+                self._side_plans[key] = (left, right)
+                self._plans[key] = node_scope & (node.left.free_symbols | node.right.free_symbols)
+                continue
+
+            inner = self._inner_scope(node, node_scope)
+            if expanded:
+                self._plans[key] = frozenset().union(*(self._plans[(id(child), inner)] for child in children(node)))
+            else:
+                stack.append((node, node_scope, True))
+                stack.extend((child, inner, False) for child in children(node))
+
+    def _substitute(self, root, scope, mapping):
+        """Return root with mapping applied according to the precomputed plans."""
+        built = {}
+        stack = [(root, scope, False)]
+        while stack:
+            node, node_scope, expanded = stack.pop()
+            key = (id(node), node_scope)
+            if key in built:
+                continue
+
+            if not self._plans[key]:
+                built[key] = node
+                continue
+
+            if node.is_relational():
+                left_touched, right_touched = self._side_plans[key]
+                left = node.left.xreplace(mapping) if left_touched else node.left
+                right = node.right.xreplace(mapping) if right_touched else node.right
+                built[key] = type(node)._unchecked(left, node.operator, right)
+                continue
+
+            inner = self._inner_scope(node, node_scope)
+            if not expanded:
+                stack.append((node, node_scope, True))
+                stack.extend((child, inner, False) for child in children(node))
+                continue
+
+            new_children = [built[(id(child), inner)] for child in children(node)]
+            if node.is_logical():
+                built[key] = type(node)._unchecked(new_children, node.type)
+            else:
+                built[key] = type(node)._unchecked(node.variables, new_children[0], new_children[1], node.type)
+
+        return built[(id(root), scope)]
+
+    def instantiate(self, bindings_batch):
+        """Return one instantiated statement per binding in bindings_batch."""
+        statement = self._statement
+        results = []
+        for binding in bindings_batch:
+            mapping = self._validate_binding(binding)
+            scope = frozenset(mapping)
+            self._plan(statement.domain, scope)
+            self._plan(statement.predicate, scope)
+
+            domain = self._substitute(statement.domain, scope, mapping)
+            predicate = self._substitute(statement.predicate, scope, mapping)
+            remaining = [var for var in self._variables if var not in mapping]
+            if remaining:
+                results.append(type(statement)._unchecked(remaining, domain, predicate, statement.type))
+            elif statement.type == "universal":
+                results.append(Logical._unchecked([domain, predicate], "implication"))
+            else:
+                # The bound values are a witness when they satisfy both, as in ModelChecker
+                results.append(Logical._unchecked([domain, predicate], "conjunction"))
+        return results
+
+
+def instantiate(statement, bindings_batch):
+    """Instantiate a Quantified statement once per binding; see Instantiator."""
+    return Instantiator(statement).instantiate(bindings_batch)
@@ -0,0 +1,141 @@
+import functools
+import time
+from contextlib import contextmanager
+from relational import Relational
+from logical import Logical
+from quantified import Quantified, _VariableCollector
+
+
+class InstrumentationStats:
+    """
+    Counters and cumulative times of MathStatement construction and validation.
+
+    nodes counts the statements built per class name, through the validating constructor or
+    _unchecked. timers maps a timed method, as "Class.method", to a [calls, seconds] pair;
+    calls of a validator are its validation passes. Times are inclusive, so the time of
+    Quantified._validate_variable_quantification contains the free_symbols lookups of its walk.
+    """
+
+    def __init__(self):
+        self.nodes = {}
+        self.timers = {}
+
+    def count_node(self, name):
+        self.nodes[name] = self.nodes.get(name, 0) + 1
+
+    def add_time(self, name, seconds):
+        timer = self.timers.get(name)
+        if timer is None:
+            self.timers[name] = [1, seconds]
+        else:
+            timer[0] += 1
+            timer[1] += seconds
+
+    def reset(self):
+        self.nodes.clear()
+        self.timers.clear()
+
+    def snapshot(self):
+        """Return a copy of the stats as plain dicts: {"nodes": {...}, "timers": {name: (calls, seconds)}}."""
+        return {"nodes": dict(self.nodes),
+                "timers": {name: (calls, seconds) for name, (calls, seconds) in self.timers.items()}}
+
+
+# Methods timed while instrumentation is enabled, per class
+TIMED_METHODS = {
+    Relational: ["_validate_operator", "_validate_sympy_expression", "_validate_sides_container"],
+    Logical: ["_validate_elements", "_validate_type"],
+    Quantified: ["_validate_variables", "_validate_math_statement", "_validate_type",
+                 "_validate_variable_quantification"],
+    _VariableCollector: ["_free_symbols"],
+}
+# Classes whose constructed nodes are counted
+COUNTED_CLASSES = [Relational, Logical, Quantified]
+
+STATS = InstrumentationStats()
+# (class, attribute name, original class attribute) for every patched attribute while enabled
+_originals = []
+
+
+def _timed(name, function):
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            STATS.add_time(name, time.perf_counter() - start)
+    return wrapper
+
+
+def _counted_init(init):
+    @functools.wraps(init)
+    def wrapper(self, *args, **kwargs):
+        STATS.count_node(type(self).__name__)
+        init(self, *args, **kwargs)
+    return wrapper
+
+
+def _counted_unchecked(unchecked):
+    @functools.wraps(unchecked)
+    def wrapper(cls, *args, **kwargs):
+        STATS.count_node(cls.__name__)
+        return unchecked(cls, *args, **kwargs)
+    return classmethod(wrapper)
+
+
+def _patch(cls, name, attribute):
+    _originals.append((cls, name, cls.__dict__[name]))
+    setattr(cls, name, attribute)
+
+
+def is_enabled():
+    return bool(_originals)
+
+
+def enable():
+    """
+    Start recording into STATS.
+
+    The timed methods and the constructors are replaced on their classes by recording
+    wrappers, and disable() puts the originals back, so disabled instrumentation costs nothing.
+    """
+    if is_enabled():
+        return
+    for cls in COUNTED_CLASSES:
+        _patch(cls, "__init__", _counted_init(cls.__dict__["__init__"]))
+        _patch(cls, "_unchecked", _counted_unchecked(cls.__dict__["_unchecked"].__func__))
+    for cls, names in TIMED_METHODS.items():
+        for name in names:
+            _patch(cls, name, _timed(f"{cls.__name__}.{name}", cls.__dict__[name]))
+
+
+def disable():
+    """Stop recording; STATS keeps what was recorded so far."""
+    while _originals:
+        cls, name, original = _originals.pop()
+        setattr(cls, name, original)
+
+
+def snapshot():
+    """Return a copy of the recorded stats; see InstrumentationStats.snapshot."""
+    return STATS.snapshot()
+
+
+def reset():
+    """Clear the recorded stats."""
+    STATS.reset()
+
+
+@contextmanager
+def instrumented(fresh=True):
+    """Record stats inside a with block, starting from empty stats unless fresh is False."""
+    if fresh:
+        reset()
+    was_enabled = is_enabled()
+    enable()
+    try:
+        yield STATS
+    finally:
+        if not was_enabled:
+            disable()
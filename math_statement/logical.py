@@ -1,8 +1,15 @@
-from math_statement import MathStatement
+from math_statement import MathStatement, StatementKind
 
 class Logical(MathStatement):
 
+    kind = StatementKind.LOGICAL
     VALID_TYPES = ["conjunction", "disjunction", "implication", "equivalence"]
+    OP_SYMBOLS = {
+        "conjunction": " ∧ ",
+        "disjunction": " ∨ ",
+        "implication": " → ",
+        "equivalence": " ↔ "
+    }
 
     def __init__(self, elements, type):
         super().__init__()
@@ -13,6 +20,15 @@ class Logical(MathStatement):
         self.elements = elements
         self.type = type
 
+    @classmethod
+    def _unchecked(cls, elements, type):
+        """Build a Logical from parts already known to be valid, skipping validation."""
+        obj = cls.__new__(cls)
+        MathStatement.__init__(obj)
+        obj._elements = list(elements)
+        obj._type = type
+        return obj
+
     def _validate_elements(self, value):
         """Validate that elements is a list of MathStatement instances."""
         if not isinstance(value, (list, tuple)):
@@ -38,6 +54,7 @@ class Logical(MathStatement):
     def elements(self, value):
         self._validate_elements(value)
         self._elements = list(value)  # Convert to list for consistency
+        self._touch()
     
     @property
     def type(self):
@@ -47,18 +64,28 @@ class Logical(MathStatement):
     def type(self, value):
         self._validate_type(value)
         self._type = value
+        self._touch()
+    
+    def _render_parts(self, mode):
+        if mode == "str":
+            separator = self.OP_SYMBOLS.get(str(self.type), f" {self.type} ")
+            parts = ["("]
+            closing = ")"
+        else:
+            separator = ", "
+            parts = ["Logical(["]
+            closing = f"], '{self.type}')"
+        for i, elem in enumerate(self._elements):
+            if i:
+                parts.append(separator)
+            parts.append((elem, mode))
+        parts.append(closing)
+        return parts
     
     def __str__(self):
         """Return a string representation of the logical statement."""
-        op_symbols = {
-            "conjunction": " ∧ ",
-            "disjunction": " ∨ ",
-            "implication": " → ",
-            "equivalence": " ↔ "
-        }
-        op_symbol = op_symbols.get(str(self.type), f" {self.type} ")
-        return f"({op_symbol.join(str(elem) for elem in self.elements)})"
+        return self._render("str")
     
     def __repr__(self):
         """Return a detailed string representation of the logical statement."""
-        return f"Logical({self.elements}, '{self.type}')"
\ No newline at end of file
+        return self._render("repr")
\ No newline at end of file
@@ -1,4 +1,19 @@
+import weakref
 from abc import ABC, abstractmethod
+from enum import Enum
+
+class StatementKind(str, Enum):
+    """Tag identifying the concrete kind of a MathStatement."""
+    
+    RELATIONAL = "relational"
+    QUANTIFIED = "quantified"
+    LOGICAL = "logical"
+
+# Module-level aliases: reading an Enum member through its class is several times slower
+# than a global lookup, and kind checks sit in traversal hot loops
+RELATIONAL = StatementKind.RELATIONAL
+QUANTIFIED = StatementKind.QUANTIFIED
+LOGICAL = StatementKind.LOGICAL
 
 class MathStatement(ABC):
     """
@@ -6,11 +21,50 @@ class MathStatement(ABC):
     
     This class serves as the common interface for Relational, Quantified, and Logical statements.
     All mathematical statement types should inherit from this class.
+    Each subclass sets kind to its StatementKind, so kind checks are a single attribute read.
     """
     
+    kind = None
+    
+    RENDER_MODES = ["str", "repr"]
+    
     def __init__(self):
         """Initialize a mathematical statement."""
-        pass
+        self._render_cache = {}  # mode -> rendering of the whole statement
+        self._parts_cache = {}  # mode -> _render_parts(mode)
+        self._dependents = None  # Weak set of the parents whose cached renderings include this node
+    
+    def _touch(self):
+        """Record a mutation, invalidating the cached renderings of this node and of every node including it."""
+        self._parts_cache.clear()
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            node._render_cache.clear()
+            dependents = node._dependents
+            if dependents:
+                # Parents register again when they cache a new rendering
+                node._dependents = None
+                stack.extend(dependents)
+    
+    def _add_dependent(self, parent):
+        if self._dependents is None:
+            self._dependents = weakref.WeakSet()
+        self._dependents.add(parent)
+    
+    # The render caches are dropped from pickles and copies: the weak set of dependents cannot
+    # be pickled, and in a copy it would still hold the parents in the original tree
+    _CACHE_ATTRIBUTES = ("_render_cache", "_parts_cache", "_dependents")
+    
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        for name in self._CACHE_ATTRIBUTES:
+            state.pop(name, None)
+        return state
+    
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        MathStatement.__init__(self)
     
     @abstractmethod
     def __str__(self):
@@ -22,17 +76,91 @@ class MathStatement(ABC):
         """Return a detailed string representation of the statement."""
         pass
     
+    @abstractmethod
+    def _render_parts(self, mode):
+        """
+        Return the rendering of this node in the given mode as a list of parts.
+        
+        Each part is either a string or a (child, mode) pair standing for the child's rendering.
+        """
+        pass
+    
+    def _parts(self, mode):
+        """Return _render_parts(mode), memoized until this node is mutated."""
+        parts = self._parts_cache.get(mode)
+        if parts is None:
+            parts = self._parts_cache[mode] = self._render_parts(mode)
+        return parts
+    
+    def _iter_rendering(self, mode, register=False):
+        """
+        Yield the rendering of this statement in pieces, walking the tree with an explicit stack.
+        
+        The parts of every node walked are memoized on that node. With register, every parent
+        expanded is registered as a dependent of its children, so that mutating any of them
+        invalidates a rendering cached from these pieces.
+        """
+        stack = [(self, mode)]
+        while stack:
+            item = stack.pop()
+            if isinstance(item, str):
+                yield item
+                continue
+            node, node_mode = item
+            cached = node._render_cache.get(node_mode)
+            if cached is not None:
+                yield cached
+                continue
+            parts = node._parts(node_mode)
+            if register:
+                for part in parts:
+                    if not isinstance(part, str):
+                        part[0]._add_dependent(node)
+            stack.extend(reversed(parts))
+    
+    def _render(self, mode):
+        """
+        Return the rendering of this statement, memoized until it or any node below it is mutated.
+        
+        Only the joined rendering of the node rendered is stored; the nodes below keep their
+        parts, so that deep chains do not store quadratically many characters.
+        """
+        rendering = self._render_cache.get(mode)
+        if rendering is None:
+            rendering = "".join(self._iter_rendering(mode, register=True))
+            self._render_cache[mode] = rendering
+        return rendering
+    
+    def write_to(self, stream, mode="str", buffer_size=65536):
+        """
+        Write the rendering of this statement to a text stream.
+        
+        Pieces are written in linear time as they are produced, in chunks of about buffer_size
+        characters, without building the whole string in memory.
+        """
+        if mode not in self.RENDER_MODES:
+            raise ValueError(f"Mode must be one of {self.RENDER_MODES}, got {mode} (type: {type(mode)})")
+        
+        buffer = []
+        size = 0
+        for piece in self._iter_rendering(mode):
+            buffer.append(piece)
+            size += len(piece)
+            if size >= buffer_size:
+                stream.write("".join(buffer))
+                buffer = []
+                size = 0
+        if buffer:
+            stream.write("".join(buffer))
+    
     def is_relational(self):
         """Check if this is a relational statement."""
-        from relational import Relational
-        return isinstance(self, Relational)
+        return self.kind is RELATIONAL
     
     def is_quantified(self):
         """Check if this is a quantified statement."""
-        from quantified import Quantified
-        return isinstance(self, Quantified)
+        return self.kind is QUANTIFIED
     
     def is_logical(self):
         """Check if this is a logical statement."""
-        from logical import Logical
-        return isinstance(self, Logical) 
\ No newline at end of file
+        return self.kind is LOGICAL 
\ No newline at end of file
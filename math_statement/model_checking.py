@@ -0,0 +1,227 @@
+import functools
+import numpy as np
+import sympy as sp
+from math_statement import MathStatement
+
+
+def integer_domain(low, high):
+    """
+    Return the bounded integer domain [low, high] as a NumPy array of Python ints.
+
+    The array has object dtype, so arithmetic on it never wraps around like int64 does.
+    """
+    if high < low:
+        raise ValueError(f"Integer domain upper bound must be >= lower bound, got [{low}, {high}]")
+    return np.array(range(low, high + 1), dtype=object)
+
+
+def real_domain(low, high, num):
+    """Return num evenly spaced samples of the real interval [low, high]."""
+    if num < 1:
+        raise ValueError(f"Real domain must have at least 1 sample, got {num}")
+    return np.linspace(low, high, num)
+
+
+class ModelCheckResult:
+    """
+    Outcome of checking a Quantified statement over a finite domain.
+
+    For a universal statement, example is the first counterexample found (or None if the
+    statement holds); for an existential statement, example is the first witness found.
+    """
+
+    def __init__(self, type, holds, example, checked):
+        self.type = type
+        self.holds = holds
+        self.example = example
+        self.checked = checked
+
+    def __bool__(self):
+        return self.holds
+
+    def __repr__(self):
+        label = "counterexample" if self.type == "universal" else "witness"
+        return f"ModelCheckResult(holds={self.holds}, {label}={self.example}, checked={self.checked})"
+
+
+class ModelChecker:
+    """
+    Decide Quantified statements over finite domains by broadcast NumPy evaluation.
+
+    domains maps every quantified SymPy symbol (including those bound by nested Quantified
+    statements) to a 1-D array of values. Integer arrays are stored with object dtype, so that
+    expressions are evaluated on Python ints instead of wrapping int64 arithmetic; an
+    expression whose functions do not accept Python ints (such as sqrt) is evaluated in float64
+    instead. The outer Cartesian grid is processed in chunks of
+    at most chunk_size points so that checking can stop at the first counterexample or witness.
+    """
+
+    RELATIONAL_OPS = {sp.Eq: np.equal, sp.Ne: np.not_equal, sp.Lt: np.less, sp.Le: np.less_equal}
+
+    def __init__(self, domains, chunk_size=65536):
+        self._domains = {}
+        self._chunk_size = None
+        self._functions = {}
+
+        self.domains = domains
+        self.chunk_size = chunk_size
+
+    def _validate_domains(self, value):
+        """Validate that domains maps SymPy symbols to non-empty 1-D value sequences."""
+        if not isinstance(value, dict):
+            raise TypeError(f"Domains must be a dict, got {value} (type: {type(value)})")
+
+        for var, values in value.items():
+            if not isinstance(var, sp.Symbol):
+                raise TypeError(f"Domain key must be a SymPy Symbol, got {var} (type: {type(var)})")
+            array = np.asarray(values)
+            if array.ndim != 1 or array.size == 0:
+                raise ValueError(f"Domain of {var} must be a non-empty 1-D sequence, got {values}")
+
+    def _validate_chunk_size(self, value):
+        """Validate that chunk_size is a positive integer."""
+        if not isinstance(value, int) or value < 1:
+            raise ValueError(f"Chunk size must be a positive integer, got {value} (type: {type(value)})")
+
+    @property
+    def domains(self):
+        return self._domains.copy()  # Return a copy to prevent direct modification
+
+    @domains.setter
+    def domains(self, value):
+        self._validate_domains(value)
+        self._domains = {var: self._exact(np.asarray(values)) for var, values in value.items()}
+
+    @staticmethod
+    def _exact(array):
+        """Return array with integer dtypes replaced by object dtype holding Python ints."""
+        if array.dtype.kind in "iu":
+            return array.astype(object)
+        return array
+
+    @property
+    def chunk_size(self):
+        return self._chunk_size
+
+    @chunk_size.setter
+    def chunk_size(self, value):
+        self._validate_chunk_size(value)
+        self._chunk_size = value
+
+    def _domain_of(self, var):
+        if var not in self._domains:
+            raise ValueError(f"No finite domain given for quantified variable {var}")
+        return self._domains[var]
+
+    def _compile(self, expr):
+        """Return a cached NumPy function of expr over its free symbols."""
+        if expr not in self._functions:
+            symbols = sorted(expr.free_symbols, key=str)
+            self._functions[expr] = (symbols, sp.lambdify(symbols, expr, "numpy"))
+        return self._functions[expr]
+
+    def _evaluate_expression(self, expr, env):
+        symbols, function = self._compile(expr)
+        for var in symbols:
+            if var not in env:
+                raise ValueError(f"Variable {var} is not bound by any enclosing quantifier")
+        args = [env[var] for var in symbols]
+        try:
+            return function(*args)
+        except (TypeError, AttributeError):
+            # NumPy functions such as sqrt have no object-dtype loop for Python ints
+            if not any(np.asarray(arg).dtype == object for arg in args):
+                raise
+            return function(*[np.asarray(arg, dtype=float) for arg in args])
+
+    def _evaluate(self, statement, env, ndim):
+        """
+        Evaluate statement to a boolean array broadcastable against the current grid.
+
+        env maps every bound symbol to an array with exactly ndim axes; nested quantifiers
+        append one axis per variable and reduce over them again.
+        """
+        if not isinstance(statement, MathStatement):
+            raise TypeError(f"Statement must be a MathStatement instance, got {statement} (type: {type(statement)})")
+
+        if statement.is_relational():
+            left = self._evaluate_expression(statement.left, env)
+            right = self._evaluate_expression(statement.right, env)
+            return self.RELATIONAL_OPS[statement.operator](left, right)
+
+        if statement.is_logical():
+            # Elements may broadcast to different shapes (constants, nested quantifier axes),
+            # so they are folded pairwise instead of stacked into one array
+            values = [self._evaluate(element, env, ndim) for element in statement.elements]
+            if statement.type == "conjunction":
+                return functools.reduce(np.logical_and, values)
+            if statement.type == "disjunction":
+                return functools.reduce(np.logical_or, values)
+            if statement.type == "implication":
+                # a1 → a2 → ... → an associates to the right: (a1 ∧ ... ∧ an-1) → an
+                premise = functools.reduce(np.logical_and, values[:-1])
+                return np.logical_or(np.logical_not(premise), values[-1])
+            first = values[0]
+            return functools.reduce(np.logical_and, [np.equal(first, value) for value in values[1:]])
+
+        variables = statement.variables
+        inner_ndim = ndim + len(variables)
+        inner_env = {var: array[(...,) + (None,) * len(variables)] for var, array in env.items()}
+        for i, var in enumerate(variables):
+            shape = [1] * inner_ndim
+            shape[ndim + i] = -1
+            inner_env[var] = self._domain_of(var).reshape(shape)
+
+        domain = self._evaluate(statement.domain, inner_env, inner_ndim)
+        predicate = self._evaluate(statement.predicate, inner_env, inner_ndim)
+        if statement.type == "universal":
+            value = np.logical_or(np.logical_not(domain), predicate)
+            reduce = np.all
+        else:
+            value = np.logical_and(domain, predicate)
+            reduce = np.any
+        value = np.asarray(value)
+        value = value.reshape((1,) * (inner_ndim - value.ndim) + value.shape)
+        return reduce(value, axis=tuple(range(ndim, inner_ndim)))
+
+    def check(self, statement):
+        """Decide a Quantified statement, stopping at the first counterexample or witness."""
+        if not isinstance(statement, MathStatement) or not statement.is_quantified():
+            raise TypeError(f"Statement must be a Quantified instance, got {statement} (type: {type(statement)})")
+
+        variables = statement.variables
+        values = [self._domain_of(var) for var in variables]
+        shape = tuple(len(v) for v in values)
+        total = int(np.prod(shape))
+        universal = statement.type == "universal"
+
+        for start in range(0, total, self._chunk_size):
+            stop = min(start + self._chunk_size, total)
+            indices = np.unravel_index(np.arange(start, stop), shape)
+            env = {var: value[index] for var, value, index in zip(variables, values, indices)}
+
+            domain = self._evaluate(statement.domain, env, 1)
+            predicate = self._evaluate(statement.predicate, env, 1)
+            if universal:
+                hits = np.logical_and(domain, np.logical_not(predicate))
+            else:
+                hits = np.logical_and(domain, predicate)
+            hits = np.broadcast_to(hits, (stop - start,))
+
+            found = np.flatnonzero(hits)
+            if found.size:
+                first = found[0]
+                example = {var: _scalar(env[var][first]) for var in variables}
+                return ModelCheckResult(statement.type, not universal, example, start + first + 1)
+
+        return ModelCheckResult(statement.type, universal, None, total)
+
+
+def _scalar(value):
+    """Return a NumPy scalar as the equivalent Python scalar, and anything else unchanged."""
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def check_quantified(statement, domains, chunk_size=65536):
+    """Decide a Quantified statement over finite domains; see ModelChecker."""
+    return ModelChecker(domains, chunk_size).check(statement)
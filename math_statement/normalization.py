@@ -0,0 +1,95 @@
+import sympy as sp
+from math_statement import MathStatement, RELATIONAL, QUANTIFIED, LOGICAL
+from traversal import children, StatementTransformer
+
+
+class Normalizer(StatementTransformer):
+    """
+    Rewrite MathStatement trees into a canonical form.
+
+    Nested conjunctions inside conjunctions (and disjunctions inside disjunctions) are
+    flattened, duplicate elements of both are removed and their elements are ordered by
+    repr; a conjunction or disjunction left with a single element is replaced by it. The
+    sides of Eq and Ne are ordered with sp.default_sort_key. Implications, equivalences and
+    quantifiers keep the order of their parts.
+
+    Every result is interned, so equal subtrees come out as one shared object, and the result
+    for each input node is memoized, so a Normalizer reused across a corpus normalizes every
+    shared subtree only once. Rebuilt nodes skip re-validation.
+    """
+
+    SYMMETRIC_OPERATORS = [sp.Eq, sp.Ne]
+    ASSOCIATIVE_TYPES = ["conjunction", "disjunction"]
+
+    def __init__(self):
+        self._memo = {}  # id(input node) -> (input node, normalized node)
+        self._interned = {}  # structural key -> normalized node
+
+    def normalize(self, node):
+        """Return the canonical form of node."""
+        if not isinstance(node, MathStatement):
+            raise TypeError(f"Statement must be a MathStatement instance, got {node} (type: {type(node)})")
+
+        memo = self._memo
+        stack = [(node, False)]
+        while stack:
+            current, expanded = stack.pop()
+            if id(current) in memo:
+                continue
+            nodes = children(current)
+            if not expanded:
+                stack.append((current, True))
+                stack.extend((child, False) for child in reversed(nodes) if id(child) not in memo)
+                continue
+            child_results = [memo[id(child)][1] for child in nodes]
+            # Keep the input node alive so that its id is not reused while memoized
+            memo[id(current)] = (current, self._method_for(type(current))(current, child_results))
+        return memo[id(node)][1]
+
+    def transform(self, node):
+        return self.normalize(node)
+
+    def visit_Relational(self, node, child_results):
+        left, right = node.left, node.right
+        if node.operator in self.SYMMETRIC_OPERATORS and sp.default_sort_key(right) < sp.default_sort_key(left):
+            left, right = right, left
+        key = (RELATIONAL, node.operator, left, right)
+        if key not in self._interned:
+            unchanged = left is node.left
+            self._interned[key] = node if unchanged else type(node)._unchecked(left, node.operator, right)
+        return self._interned[key]
+
+    def visit_Logical(self, node, child_results):
+        elements = child_results
+        if node.type in self.ASSOCIATIVE_TYPES:
+            flat = []
+            for element in elements:
+                if element.kind is LOGICAL and element.type == node.type:
+                    flat.extend(element.elements)  # Already flat, deduplicated and sorted
+                else:
+                    flat.append(element)
+            # Elements are interned, so duplicates are the same object
+            elements = sorted({id(element): element for element in flat}.values(), key=repr)
+            if len(elements) == 1:
+                return elements[0]
+
+        key = (LOGICAL, node.type, tuple(id(element) for element in elements))
+        if key not in self._interned:
+            unchanged = len(elements) == len(node.elements) and all(
+                new is old for new, old in zip(elements, node.elements))
+            self._interned[key] = node if unchanged else type(node)._unchecked(elements, node.type)
+        return self._interned[key]
+
+    def visit_Quantified(self, node, child_results):
+        domain, predicate = child_results
+        key = (QUANTIFIED, node.type, tuple(node.variables), id(domain), id(predicate))
+        if key not in self._interned:
+            unchanged = domain is node.domain and predicate is node.predicate
+            self._interned[key] = node if unchanged else type(node)._unchecked(
+                node.variables, domain, predicate, node.type)
+        return self._interned[key]
+
+
+def normalize(statement):
+    """Return the canonical form of statement; see Normalizer."""
+    return Normalizer().normalize(statement)
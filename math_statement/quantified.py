@@ -1,9 +1,12 @@
 import sympy as sp
-from math_statement import MathStatement
+from math_statement import MathStatement, StatementKind
 from logical import Logical
+from traversal import StatementVisitor
+from instantiation import Instantiator
 
 class Quantified(MathStatement):
 
+    kind = StatementKind.QUANTIFIED
     VALID_TYPES = ["universal", "existential"]
     
     def __init__(self, variables, domain, predicate, type):
@@ -20,6 +23,17 @@ class Quantified(MathStatement):
         self.predicate = predicate
         self.type = type
     
+    @classmethod
+    def _unchecked(cls, variables, domain, predicate, type):
+        """Build a Quantified from parts already known to be valid, skipping validation."""
+        obj = cls.__new__(cls)
+        MathStatement.__init__(obj)
+        obj._variables = list(variables)
+        obj._domain = domain
+        obj._predicate = predicate
+        obj._type = type
+        return obj
+    
     def _validate_variables(self, value):
         """Validate that variables is a list of SymPy symbols."""
         if not isinstance(value, (list, tuple)):
@@ -50,6 +64,7 @@ class Quantified(MathStatement):
     def variables(self, value):
         self._validate_variables(value)
         self._variables = list(value)  # Convert to list for consistency
+        self._touch()
     
     @property
     def domain(self):
@@ -59,6 +74,7 @@ class Quantified(MathStatement):
     def domain(self, value):
         self._validate_math_statement(value, "Domain")
         self._domain = value
+        self._touch()
         # Validate variable quantification after setting domain
         if self._predicate is not None:
             self._validate_variable_quantification(self._domain, self._predicate)
@@ -71,6 +87,7 @@ class Quantified(MathStatement):
     def predicate(self, value):
         self._validate_math_statement(value, "Predicate")
         self._predicate = value
+        self._touch()
         # Validate variable quantification after setting predicate
         if self._domain is not None:
             self._validate_variable_quantification(self._domain, self._predicate)
@@ -83,56 +100,44 @@ class Quantified(MathStatement):
     def type(self, value):
         self._validate_type(value)
         self._type = value
+        self._touch()
+    
+    def _render_parts(self, mode):
+        # Both modes show domain and predicate in their str form
+        if mode == "str":
+            quantifier = "∀" if self.type == "universal" else "∃"
+            vars_str = ", ".join(str(var) for var in self._variables)
+            return [f"{quantifier}{vars_str} (", (self._domain, "str"), " → ", (self._predicate, "str"), ")"]
+        return [f"Quantified({self._variables}, ", (self._domain, "str"), ", ", (self._predicate, "str"),
+                f", '{self.type}')"]
     
     def __str__(self):
         """Return a string representation of the quantified statement."""
-        quantifier = "∀" if self.type == "universal" else "∃"
-        vars_str = ", ".join(str(var) for var in self.variables)
-        return f"{quantifier}{vars_str} ({self.domain} → {self.predicate})"
+        return self._render("str")
     
     def __repr__(self):
         """Return a detailed string representation of the quantified statement."""
-        return f"Quantified({self.variables}, {self.domain}, {self.predicate}, '{self.type}')"
+        return self._render("repr")
+
+    def instantiate(self, bindings_batch):
+        """
+        Instantiate this statement once per binding in bindings_batch.
+
+        Each binding maps some of the quantified variables to closed SymPy values. Bound
+        variables are removed from the quantifier; if all of them are bound, the result is the
+        implication domain → predicate for a universal statement and the conjunction
+        domain ∧ predicate for an existential one. Subtrees not mentioning a bound variable
+        are shared.
+        """
+        return Instantiator(self).instantiate(bindings_batch)
 
     def _validate_variable_quantification(self, domain, predicate):
         """Validate that all variables in Relational objects are quantified."""
-        from relational import Relational
-        from logical import Logical
-        
-        def collect_variables_from_relational(rel_obj, quantified_in_current_scope):
-            """Recursively collect all SymPy variables from a Relational object."""
-            variables = set()
-            
-            if isinstance(rel_obj, Relational):
-                # Collect variables from left and right sides
-                for side in [rel_obj.left, rel_obj.right]:
-                    if hasattr(side, 'free_symbols'):
-                        variables.update(side.free_symbols)
-            elif isinstance(rel_obj, Logical):
-                # Recursively check all elements
-                for element in rel_obj.elements:
-                    variables.update(collect_variables_from_relational(element, quantified_in_current_scope))
-            elif isinstance(rel_obj, Quantified):
-                # First, validate that the inner quantified statement is well-formed
-                inner_quantified = set(rel_obj.variables)
-                inner_domain_vars = collect_variables_from_relational(rel_obj.domain, inner_quantified)
-                inner_predicate_vars = collect_variables_from_relational(rel_obj.predicate, inner_quantified)
-                inner_all_vars = inner_domain_vars.union(inner_predicate_vars)
-                inner_unquantified = inner_all_vars - inner_quantified
-                
-                if inner_unquantified:
-                    var_names = ", ".join(str(var) for var in inner_unquantified)
-                    raise ValueError(f"Inner quantified statement has unquantified variables: {var_names}")
-                
-                # If inner statement is valid, only add variables that are not quantified in the inner scope
-                variables.update(inner_all_vars - inner_quantified)
-            
-            return variables
-        
         # Collect all variables from domain and predicate
+        collector = _VariableCollector()
         all_variables = set()
-        all_variables.update(collect_variables_from_relational(domain, set(self._variables)))
-        all_variables.update(collect_variables_from_relational(predicate, set(self._variables)))
+        all_variables.update(collector.visit(domain))
+        all_variables.update(collector.visit(predicate))
         
         # Get the set of quantified variables
         quantified_vars = set(self._variables)
@@ -142,3 +147,34 @@ class Quantified(MathStatement):
         if unquantified_vars:
             var_names = ", ".join(str(var) for var in unquantified_vars)
             raise ValueError(f"All variables in Relational objects must be quantified. Unquantified variables: {var_names}")
+
+
+class _VariableCollector(StatementVisitor):
+    """Collect all SymPy variables that are free in a statement, bottom-up."""
+
+    def visit_Relational(self, rel_obj, child_results):
+        # Collect variables from left and right sides
+        variables = set()
+        for side in [rel_obj.left, rel_obj.right]:
+            variables.update(self._free_symbols(side))
+        return variables
+
+    def _free_symbols(self, expr):
+        """Return the free symbols of a SymPy expression, or an empty set for anything else."""
+        return expr.free_symbols if hasattr(expr, 'free_symbols') else set()
+
+    def visit_Logical(self, logical_obj, child_results):
+        return set().union(*child_results)
+
+    def visit_Quantified(self, quantified_obj, child_results):
+        # First, validate that the inner quantified statement is well-formed
+        inner_quantified = set(quantified_obj.variables)
+        inner_all_vars = set().union(*child_results)
+        inner_unquantified = inner_all_vars - inner_quantified
+
+        if inner_unquantified:
+            var_names = ", ".join(str(var) for var in inner_unquantified)
+            raise ValueError(f"Inner quantified statement has unquantified variables: {var_names}")
+
+        # If inner statement is valid, only add variables that are not quantified in the inner scope
+        return inner_all_vars - inner_quantified
@@ -1,9 +1,12 @@
 import sympy as sp
-from math_statement import MathStatement
+from math_statement import MathStatement, StatementKind
 
 class Relational(MathStatement):
 
+    kind = StatementKind.RELATIONAL
     VALID_OPERATORS = [sp.Eq, sp.Ne, sp.Lt, sp.Le]
+    OP_SYMBOLS = {sp.Eq: "=", sp.Ne: "≠", sp.Lt: "<", sp.Le: "≤"}
+    OP_NAMES = {sp.Eq: "Eq", sp.Ne: "Ne", sp.Lt: "Lt", sp.Le: "Le"}
 
     def __init__(self, left, operator, right):
         super().__init__()
@@ -14,6 +17,15 @@ class Relational(MathStatement):
         self.operator = operator
         self.sides = [left, right]
     
+    @classmethod
+    def _unchecked(cls, left, operator, right):
+        """Build a Relational from parts already known to be valid, skipping validation."""
+        obj = cls.__new__(cls)
+        MathStatement.__init__(obj)
+        obj._operator = operator
+        obj._sides = [left, right]
+        return obj
+    
     def _validate_operator(self, value):
         """Validate that the operator is in VALID_OPERATORS."""
         if value not in self.VALID_OPERATORS:
@@ -37,6 +49,7 @@ class Relational(MathStatement):
     def operator(self, value):
         self._validate_operator(value)
         self._operator = value
+        self._touch()
     
     @property
     def left(self):
@@ -46,6 +59,7 @@ class Relational(MathStatement):
     def left(self, value):
         self._validate_sympy_expression(value, "Left")
         self._sides[0] = value
+        self._touch()
     
     @property
     def right(self):
@@ -55,6 +69,7 @@ class Relational(MathStatement):
     def right(self, value):
         self._validate_sympy_expression(value, "Right")
         self._sides[1] = value
+        self._touch()
     
     @property
     def sides(self):
@@ -69,15 +84,19 @@ class Relational(MathStatement):
         self._validate_sympy_expression(right, "Right")
         
         self._sides = [left, right]
+        self._touch()
+    
+    def _render_parts(self, mode):
+        if mode == "str":
+            op_symbol = self.OP_SYMBOLS.get(self.operator, str(self.operator))
+            return [f"{self.left} {op_symbol} {self.right}"]
+        op_name = self.OP_NAMES.get(self.operator, str(self.operator))
+        return [f"Relational({self.left}, {op_name}, {self.right})"]
     
     def __str__(self):
         """Return a string representation of the relational statement."""
-        op_symbols = {sp.Eq: "=", sp.Ne: "≠", sp.Lt: "<", sp.Le: "≤"}
-        op_symbol = op_symbols.get(self.operator, str(self.operator))
-        return f"{self.left} {op_symbol} {self.right}"
+        return self._render("str")
     
     def __repr__(self):
         """Return a detailed string representation of the relational statement."""
-        op_names = {sp.Eq: "Eq", sp.Ne: "Ne", sp.Lt: "Lt", sp.Le: "Le"}
-        op_name = op_names.get(self.operator, str(self.operator))
-        return f"Relational({self.left}, {op_name}, {self.right})"
+        return self._render("repr")
@@ -0,0 +1,79 @@
+import pytest
+import sympy as sp
+import sys
+import os
+
+# Add the parent directory to the path so we can import the modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from relational import Relational
+from quantified import Quantified
+from logical import Logical
+from corpus import StatementCorpus
+
+
+class TestStatementCorpus:
+    """Test cases for the indexed statement corpus."""
+
+    def setup_method(self):
+        """Set up test fixtures before each test method."""
+        self.x = sp.Symbol('x')
+        self.y = sp.Symbol('y')
+
+        self.rel_x = Relational(self.x, sp.Lt, sp.Integer(5))
+        self.rel_y = Relational(self.y, sp.Eq, sp.Integer(3))
+        self.logical = Logical([self.rel_x, self.rel_y], "disjunction")
+        self.exists = Quantified([self.x], self.rel_x, self.rel_x, "existential")
+        self.forall = Quantified([self.x, self.y], self.rel_y, self.logical, "universal")
+
+        self.corpus = StatementCorpus()
+        self.ids = [self.corpus.add(stmt) for stmt in
+                    [self.rel_x, self.rel_y, self.logical, self.exists, self.forall]]
+
+    def test_add_and_lookup(self):
+        """Test that statements get sequential IDs and can be looked up."""
+        assert self.ids == [0, 1, 2, 3, 4]
+        assert len(self.corpus) == 5
+        assert self.corpus[3] is self.exists
+        assert set(self.corpus) == set(self.ids)
+
+    def test_single_key_queries(self):
+        """Test queries by symbol, operator, connective, kind and quantifier."""
+        assert self.corpus.query(symbols=[self.y]) == {1, 2, 4}
+        assert self.corpus.query(operators=[sp.Lt]) == {0, 2, 3, 4}
+        assert self.corpus.query(connectives=["disjunction"]) == {2, 4}
+        assert self.corpus.query(kinds=["quantified"]) == {3, 4}
+        assert self.corpus.query(quantifiers=["existential"]) == {3}
+
+    def test_conjunctive_queries(self):
+        """Test that multiple keys are intersected."""
+        assert self.corpus.query(symbols=[self.x], operators=[sp.Eq]) == {2, 4}
+        assert self.corpus.query(symbols=[self.x, self.y], kinds=["quantified"]) == {4}
+        assert self.corpus.query(operators=[sp.Le]) == set()
+        assert self.corpus.query() == set(self.ids)
+
+    def test_incremental_remove(self):
+        """Test that removal updates every index."""
+        assert self.corpus.remove(3) is self.exists
+        assert 3 not in self.corpus
+        assert self.corpus.query(quantifiers=["existential"]) == set()
+        assert "existential" not in self.corpus.keys("quantifiers")
+        assert self.corpus.query(symbols=[self.x]) == {0, 2, 4}
+
+        new_id = self.corpus.add(self.exists)
+        assert new_id == 5
+        assert self.corpus.query(quantifiers=["existential"]) == {5}
+
+    def test_invalid_arguments(self):
+        """Test that invalid statements, IDs and fields are rejected."""
+        with pytest.raises(TypeError, match="must be a MathStatement instance"):
+            self.corpus.add("x < 5")
+        with pytest.raises(KeyError, match="No statement with ID 42"):
+            self.corpus.remove(42)
+        with pytest.raises(ValueError, match="Field must be one of"):
+            self.corpus.keys("shapes")
+
+
+if __name__ == "__main__":
+    # Run tests if this file is executed directly
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,87 @@
+import pytest
+import sympy as sp
+import sys
+import os
+
+# Add the parent directory to the path so we can import the modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from relational import Relational
+from quantified import Quantified
+from logical import Logical
+from instantiation import instantiate
+
+
+class TestInstantiation:
+    """Test cases for batch instantiation of Quantified statements."""
+
+    def setup_method(self):
+        """Set up test fixtures before each test method."""
+        self.x = sp.Symbol('x')
+        self.y = sp.Symbol('y')
+
+        self.x_small = Relational(self.x, sp.Lt, sp.Integer(3))
+        self.constant = Relational(sp.Integer(0), sp.Lt, sp.Integer(1))
+        self.y_bound = Relational(self.y, sp.Le, self.x**2)
+        self.inner = Quantified([self.x], Relational(self.x, sp.Lt, sp.Integer(1)),
+                                Relational(self.x, sp.Le, sp.Integer(1)), "existential")
+
+        self.domain = Logical([self.x_small, self.constant], "conjunction")
+        self.predicate = Logical([self.y_bound, self.inner], "disjunction")
+        self.quant = Quantified([self.x, self.y], self.domain, self.predicate, "universal")
+
+    def test_partial_instantiation(self):
+        """Test that binding some variables keeps the others quantified."""
+        result, = self.quant.instantiate([{self.x: 1}])
+        assert result.is_quantified()
+        assert result.variables == [self.y]
+        assert str(result) == "∀y ((1 < 3 ∧ 0 < 1) → (y ≤ 1 ∨ ∃x (x < 1 → x ≤ 1)))"
+
+    def test_full_instantiation_batch(self):
+        """Test that binding all variables yields domain → predicate for every binding."""
+        results = instantiate(self.quant, [{self.x: 2, self.y: sp.Rational(1, 2)}, {self.x: 5, self.y: 0}])
+        assert [str(result) for result in results] == [
+            "((2 < 3 ∧ 0 < 1) → (1/2 ≤ 4 ∨ ∃x (x < 1 → x ≤ 1)))",
+            "((5 < 3 ∧ 0 < 1) → (0 ≤ 25 ∨ ∃x (x < 1 → x ≤ 1)))",
+        ]
+        assert all(result.is_logical() and result.type == "implication" for result in results)
+
+    def test_full_instantiation_existential(self):
+        """Test that binding all variables of an existential yields domain ∧ predicate."""
+        quant = Quantified([self.x, self.y], self.domain, self.predicate, "existential")
+        result, = quant.instantiate([{self.x: 2, self.y: 1}])
+        assert result.is_logical() and result.type == "conjunction"
+        assert str(result) == "((2 < 3 ∧ 0 < 1) ∧ (1 ≤ 4 ∨ ∃x (x < 1 → x ≤ 1)))"
+
+        partial, = quant.instantiate([{self.y: 1}])
+        assert partial.is_quantified() and partial.type == "existential"
+
+    def test_untouched_subtrees_are_shared(self):
+        """Test that nodes without bound variables are reused, respecting nested scopes."""
+        result, = self.quant.instantiate([{self.x: 1}])
+        domain_elements = result.domain.elements
+        predicate_elements = result.predicate.elements
+
+        assert domain_elements[1] is self.constant
+        assert predicate_elements[1] is self.inner  # x is re-bound by the inner quantifier
+        assert predicate_elements[0] is not self.y_bound
+        assert self.quant.domain is self.domain  # The original is not modified
+
+        result, = self.quant.instantiate([{self.y: 7}])
+        assert result.domain is self.domain
+
+    def test_invalid_bindings(self):
+        """Test that invalid bindings are rejected."""
+        with pytest.raises(TypeError, match="Binding must be a dict"):
+            self.quant.instantiate([[self.x, 1]])
+        with pytest.raises(ValueError, match="Binding variable must be one of"):
+            self.quant.instantiate([{sp.Symbol('z'): 1}])
+        with pytest.raises(ValueError, match="must be a closed SymPy expression"):
+            self.quant.instantiate([{self.x: self.y + 1}])
+        with pytest.raises(TypeError, match="must be a Quantified instance"):
+            instantiate(self.x_small, [{self.x: 1}])
+
+
+if __name__ == "__main__":
+    # Run tests if this file is executed directly
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,98 @@
+import pytest
+import sympy as sp
+import sys
+import os
+
+# Add the parent directory to the path so we can import the modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import instrumentation
+from relational import Relational
+from quantified import Quantified
+from logical import Logical
+from normalization import normalize
+
+
+class TestInstrumentation:
+    """Test cases for construction and validation instrumentation."""
+
+    def setup_method(self):
+        """Set up test fixtures before each test method."""
+        self.x = sp.Symbol('x')
+        self.y = sp.Symbol('y')
+        instrumentation.reset()
+
+    def teardown_method(self):
+        instrumentation.disable()
+
+    def build(self):
+        domain = Logical([Relational(self.x, sp.Lt, sp.Integer(5)), Relational(self.y, sp.Le, sp.Integer(3))],
+                         "conjunction")
+        return Quantified([self.x, self.y], domain, Relational(self.x, sp.Eq, self.y), "universal")
+
+    def test_counts(self):
+        """Test node counts per class and validation passes per validator."""
+        with instrumentation.instrumented():
+            self.build()
+        stats = instrumentation.snapshot()
+        assert stats["nodes"] == {"Relational": 3, "Logical": 1, "Quantified": 1}
+        timers = stats["timers"]
+        assert timers["Relational._validate_sympy_expression"][0] == 6
+        assert timers["Relational._validate_operator"][0] == 3
+        assert timers["Logical._validate_elements"][0] == 1
+        assert timers["Quantified._validate_math_statement"][0] == 2
+        # Only the predicate setter runs the walk, domain is set while the predicate is None
+        assert timers["Quantified._validate_variable_quantification"][0] == 1
+        assert timers["_VariableCollector._free_symbols"][0] == 6
+        assert all(seconds >= 0 for _, seconds in timers.values())
+
+    def test_unchecked_nodes_are_counted(self):
+        """Test that nodes rebuilt without validation are counted but run no validator."""
+        stmt = Logical([Relational(self.y, sp.Eq, self.x), Relational(self.x, sp.Lt, self.y)], "conjunction")
+        with instrumentation.instrumented():
+            normalize(stmt)
+        stats = instrumentation.snapshot()
+        assert stats["nodes"] == {"Relational": 1, "Logical": 1}
+        assert stats["timers"] == {}
+
+    def test_disabled_restores_methods(self):
+        """Test that disabling puts the original methods back and records nothing more."""
+        original_init = Relational.__dict__["__init__"]
+        original_unchecked = Relational.__dict__["_unchecked"]
+        instrumentation.enable()
+        instrumentation.enable()
+        assert Relational.__dict__["__init__"] is not original_init
+        instrumentation.disable()
+        assert not instrumentation.is_enabled()
+        assert Relational.__dict__["__init__"] is original_init
+        assert Relational.__dict__["_unchecked"] is original_unchecked
+
+        instrumentation.reset()
+        self.build()
+        assert instrumentation.snapshot() == {"nodes": {}, "timers": {}}
+
+    def test_snapshot_is_a_copy(self):
+        """Test that a snapshot does not change with later recording and reset keeps it."""
+        with instrumentation.instrumented():
+            Relational(self.x, sp.Lt, self.y)
+            first = instrumentation.snapshot()
+            Relational(self.x, sp.Lt, self.y)
+        assert first["nodes"] == {"Relational": 1}
+        assert instrumentation.snapshot()["nodes"] == {"Relational": 2}
+        instrumentation.reset()
+        assert first["nodes"] == {"Relational": 1}
+
+    def test_failed_validation_is_timed(self):
+        """Test that a validator raising an error still records its pass."""
+        with instrumentation.instrumented():
+            with pytest.raises(ValueError, match="Unquantified variables"):
+                Quantified([self.x], Relational(self.x, sp.Lt, self.y), Relational(self.x, sp.Eq, self.x),
+                           "universal")
+        timers = instrumentation.snapshot()["timers"]
+        assert timers["Quantified._validate_variable_quantification"][0] == 1
+        assert instrumentation.snapshot()["nodes"] == {"Relational": 2, "Quantified": 1}
+
+
+if __name__ == "__main__":
+    # Run tests if this file is executed directly
+    pytest.main([__file__, "-v"])
@@ -9,7 +9,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from relational import Relational
 from quantified import Quantified
 from logical import Logical
-from math_statement import MathStatement
+from math_statement import MathStatement, StatementKind
 
 
 class TestMathStatementUnifiedInterface:
@@ -77,6 +77,16 @@ class TestMathStatementUnifiedInterface:
             assert stmt.is_logical() == isinstance(stmt, Logical)
             assert stmt.is_quantified() == isinstance(stmt, Quantified)
     
+    def test_kind_tags(self):
+        """Test that each statement class carries its StatementKind tag."""
+        logical = Logical([self.rel1, self.rel2], "conjunction")
+        quant = Quantified([self.x], self.rel1, self.rel2, "universal")
+        
+        assert self.rel1.kind is StatementKind.RELATIONAL
+        assert logical.kind is StatementKind.LOGICAL
+        assert quant.kind is StatementKind.QUANTIFIED
+        assert quant.kind == "quantified"
+    
     def test_complex_nested_structure(self):
         """Test complex nested mathematical statements."""
         # Create nested logical statement
@@ -0,0 +1,131 @@
+import pytest
+import sympy as sp
+import sys
+import os
+
+# Add the parent directory to the path so we can import the modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from relational import Relational
+from quantified import Quantified
+from logical import Logical
+from model_checking import ModelChecker, check_quantified, integer_domain, real_domain
+
+
+class TestModelChecking:
+    """Test cases for finite-domain model checking of Quantified statements."""
+
+    def setup_method(self):
+        """Set up test fixtures before each test method."""
+        self.x = sp.Symbol('x')
+        self.y = sp.Symbol('y')
+
+        self.x_nonneg = Relational(sp.Integer(0), sp.Le, self.x)
+        self.x_small = Relational(self.x, sp.Lt, sp.Integer(5))
+
+    def test_universal_holds(self):
+        """Test that a true universal statement holds with no counterexample."""
+        square_nonneg = Relational(sp.Integer(0), sp.Le, self.x**2)
+        quant = Quantified([self.x], self.x_nonneg, square_nonneg, "universal")
+
+        result = check_quantified(quant, {self.x: integer_domain(-10, 10)})
+        assert result.holds
+        assert result.example is None
+        assert result.checked == 21
+
+    def test_universal_counterexample(self):
+        """Test that the first counterexample is reported and checking stops there."""
+        quant = Quantified([self.x], self.x_nonneg, self.x_small, "universal")
+
+        result = check_quantified(quant, {self.x: integer_domain(-10, 10)}, chunk_size=4)
+        assert not result.holds
+        assert result.example == {self.x: 5}
+        assert result.checked == 16
+
+    def test_existential_witness(self):
+        """Test that the first witness is reported for an existential statement."""
+        domain = Logical([self.x_nonneg, Relational(self.y, sp.Lt, self.x)], "conjunction")
+        predicate = Relational(self.x + self.y, sp.Eq, sp.Integer(7))
+        quant = Quantified([self.x, self.y], domain, predicate, "existential")
+
+        result = check_quantified(quant, {self.x: integer_domain(0, 9), self.y: integer_domain(0, 9)})
+        assert result.holds
+        assert result.example == {self.x: 4, self.y: 3}
+
+    def test_existential_no_witness(self):
+        """Test that an existential statement without witness does not hold."""
+        predicate = Relational(self.x**2, sp.Lt, sp.Integer(0))
+        quant = Quantified([self.x], self.x_nonneg, predicate, "existential")
+
+        result = check_quantified(quant, {self.x: real_domain(0, 3, 31)})
+        assert not result.holds
+        assert result.example is None
+        assert result.checked == 31
+
+    def test_nested_quantifier(self):
+        """Test that nested quantifiers are reduced over their own grid axes."""
+        y_nonneg = Relational(sp.Integer(0), sp.Le, self.y)
+        inner = Quantified([self.y], y_nonneg, Relational(self.y, sp.Le, sp.Integer(3)), "existential")
+        quant = Quantified([self.x], self.x_nonneg, inner, "universal")
+
+        result = check_quantified(quant, {self.x: integer_domain(0, 3), self.y: integer_domain(0, 3)})
+        assert result.holds
+
+    def test_no_integer_overflow(self):
+        """Test that integer domains are evaluated exactly instead of wrapping around."""
+        domain = Logical([self.x_nonneg, Relational(self.x, sp.Le, sp.Integer(70))], "conjunction")
+        predicate = Relational(2**self.x, sp.Le, sp.Integer(2)**62)
+        quant = Quantified([self.x], domain, predicate, "universal")
+
+        result = check_quantified(quant, {self.x: integer_domain(0, 70)})
+        assert not result.holds
+        assert result.example == {self.x: 63}
+        assert type(result.example[self.x]) is int
+
+        # Plain int64 arrays are promoted the same way
+        np_domain = ModelChecker({self.x: list(range(71))}).domains[self.x]
+        assert check_quantified(quant, {self.x: np_domain}).example == {self.x: 63}
+
+    def test_float_fallback(self):
+        """Test that functions without a Python int loop are evaluated in float64."""
+        predicate = Relational(sp.sqrt(self.x), sp.Le, sp.Integer(3))
+        quant = Quantified([self.x], self.x_nonneg, predicate, "universal")
+
+        result = check_quantified(quant, {self.x: integer_domain(0, 10)})
+        assert result.example == {self.x: 10}
+
+    def test_constant_element(self):
+        """Test that a constant element next to grid-dependent ones broadcasts in a conjunction."""
+        constant = Relational(sp.Integer(0), sp.Le, sp.Integer(1))
+        domain = Logical([self.x_nonneg, constant], "conjunction")
+        predicate = Logical([self.x_small, Relational(sp.Integer(1), sp.Lt, sp.Integer(5))], "conjunction")
+        quant = Quantified([self.x], domain, predicate, "universal")
+        assert check_quantified(quant, {self.x: integer_domain(0, 3)}).holds
+
+        y_nonneg = Relational(sp.Integer(0), sp.Le, self.y)
+        inner = Quantified([self.y], y_nonneg, Relational(self.y, sp.Le, sp.Integer(3)), "existential")
+        mixed = Logical([constant, self.x_small, inner], "conjunction")
+        quant = Quantified([self.x], self.x_nonneg, mixed, "universal")
+        assert check_quantified(quant, {self.x: integer_domain(0, 3), self.y: integer_domain(0, 3)}).holds
+
+    def test_missing_domain(self):
+        """Test that quantified variables without a domain raise ValueError."""
+        quant = Quantified([self.x], self.x_nonneg, self.x_small, "universal")
+        with pytest.raises(ValueError, match="No finite domain given"):
+            check_quantified(quant, {self.y: integer_domain(0, 3)})
+
+    def test_invalid_arguments(self):
+        """Test that invalid checker arguments and statements are rejected."""
+        with pytest.raises(TypeError, match="Domain key must be a SymPy Symbol"):
+            ModelChecker({"x": [1, 2]})
+        with pytest.raises(ValueError, match="non-empty 1-D sequence"):
+            ModelChecker({self.x: []})
+        with pytest.raises(ValueError, match="Chunk size must be a positive integer"):
+            ModelChecker({self.x: [1, 2]}, chunk_size=0)
+        with pytest.raises(TypeError, match="must be a Quantified instance"):
+            ModelChecker({self.x: [1, 2]}).check(self.x_small)
+
+
+if __name__ == "__main__":
+    # Run tests if this file is executed directly
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,102 @@
+import pytest
+import sympy as sp
+import sys
+import os
+
+# Add the parent directory to the path so we can import the modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from relational import Relational
+from quantified import Quantified
+from logical import Logical
+from traversal import preorder
+from normalization import Normalizer, normalize
+
+
+class TestNormalization:
+    """Test cases for the canonical normalization pass."""
+
+    def setup_method(self):
+        """Set up test fixtures before each test method."""
+        self.x = sp.Symbol('x')
+        self.y = sp.Symbol('y')
+
+        self.a = Relational(self.x, sp.Lt, sp.Integer(5))
+        self.b = Relational(self.y, sp.Le, sp.Integer(3))
+        self.c = Relational(self.x, sp.Eq, self.y)
+
+    def test_flatten_dedupe_and_order(self):
+        """Test that nested conjunctions are flattened, deduplicated and ordered."""
+        nested = Logical([self.b, Logical([self.a, Logical([self.b, self.c], "conjunction")], "conjunction")],
+                         "conjunction")
+        result = normalize(nested)
+        assert result.type == "conjunction"
+        assert [repr(e) for e in result.elements] == sorted(repr(e) for e in [self.a, self.b, self.c])
+
+        reordered = Logical([self.c, self.a, self.b, self.a], "conjunction")
+        assert normalize(reordered).elements == result.elements
+
+    def test_mixed_types_are_not_flattened(self):
+        """Test that a disjunction inside a conjunction and implications keep their structure."""
+        inner = Logical([self.b, self.a], "disjunction")
+        outer = Logical([inner, self.c], "conjunction")
+        result = normalize(outer)
+        assert len(result.elements) == 2
+        assert any(e.is_logical() and e.type == "disjunction" for e in result.elements)
+
+        implication = Logical([self.b, self.a], "implication")
+        assert normalize(implication) is implication
+
+    def test_single_element_collapses(self):
+        """Test that a conjunction of duplicates collapses to its only element."""
+        twice = Logical([self.a, Relational(self.x, sp.Lt, sp.Integer(5))], "conjunction")
+        assert normalize(twice) is self.a
+
+    def test_symmetric_relational(self):
+        """Test that the sides of Eq and Ne are ordered and those of Lt are not."""
+        swapped = Relational(self.y, sp.Eq, self.x)
+        assert normalize(swapped).sides == [self.x, self.y]
+        lt = Relational(self.y, sp.Lt, self.x)
+        assert normalize(lt) is lt
+        disjunction = Logical([swapped, self.c], "disjunction")
+        assert normalize(disjunction).sides == [self.x, self.y]
+
+    def test_quantified_and_sharing(self):
+        """Test that quantifier bodies are normalized and equal subtrees are shared."""
+        domain = Logical([self.b, Logical([self.a, self.b], "conjunction")], "conjunction")
+        predicate = Logical([Relational(self.y, sp.Eq, self.x), self.c], "disjunction")
+        quant = Quantified([self.x, self.y], domain, predicate, "universal")
+
+        normalizer = Normalizer()
+        result = normalizer.normalize(quant)
+        assert result.variables == [self.x, self.y]
+        assert len(result.domain.elements) == 2
+        assert result.predicate.sides == [self.x, self.y]
+
+        copy = Quantified([self.x, self.y], Logical([self.a, self.b], "conjunction"), self.c, "universal")
+        assert normalizer.normalize(copy) is result
+        assert normalizer.normalize(quant) is result
+
+    def test_unchanged_tree_is_shared(self):
+        """Test that an already canonical tree is returned as is."""
+        canonical = normalize(Logical([self.a, self.b, self.c], "conjunction"))
+        assert normalize(canonical) is canonical
+
+    def test_deep_nesting(self):
+        """Test that normalization does not recurse on deep chains."""
+        stmt = self.a
+        for i in range(5000):
+            stmt = Logical([Relational(self.y, sp.Le, sp.Integer(i % 7)), stmt], "conjunction")
+        result = normalize(stmt)
+        assert len(result.elements) == 8
+        assert sum(1 for _ in preorder(result)) == 9
+
+    def test_invalid_statement(self):
+        """Test that anything but a MathStatement is rejected."""
+        with pytest.raises(TypeError, match="must be a MathStatement instance"):
+            normalize(self.x)
+
+
+if __name__ == "__main__":
+    # Run tests if this file is executed directly
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,129 @@
+import copy
+import io
+import pickle
+import pytest
+import sympy as sp
+import sys
+import os
+
+# Add the parent directory to the path so we can import the modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from relational import Relational
+from quantified import Quantified
+from logical import Logical
+
+
+class TestRendering:
+    """Test cases for cached and streaming rendering of statements."""
+
+    def setup_method(self):
+        """Set up test fixtures before each test method."""
+        self.x = sp.Symbol('x')
+        self.y = sp.Symbol('y')
+
+        self.rel1 = Relational(self.x, sp.Lt, sp.Integer(5))
+        self.rel2 = Relational(self.y, sp.Le, sp.Integer(3))
+        self.logical = Logical([self.rel1, self.rel2], "conjunction")
+        self.quant = Quantified([self.x, self.y], self.rel1, self.logical, "universal")
+
+    def test_rendering_is_memoized(self):
+        """Test that repeated rendering returns the cached string."""
+        first = str(self.quant)
+        assert first == "∀x, y (x < 5 → (x < 5 ∧ y ≤ 3))"
+        assert str(self.quant) is first
+        assert repr(self.logical) == "Logical([Relational(x, Lt, 5), Relational(y, Le, 3)], 'conjunction')"
+
+    def test_mutation_invalidates_cache(self):
+        """Test that mutating any node, including a child, refreshes cached renderings."""
+        assert str(self.quant) == "∀x, y (x < 5 → (x < 5 ∧ y ≤ 3))"
+        self.rel2.operator = sp.Eq
+        assert str(self.quant) == "∀x, y (x < 5 → (x < 5 ∧ y = 3))"
+        self.logical.type = "disjunction"
+        assert str(self.quant) == "∀x, y (x < 5 → (x < 5 ∨ y = 3))"
+
+    def test_unrelated_construction_keeps_cache(self):
+        """Test that building or mutating other statements does not drop a cached rendering."""
+        first = str(self.quant)
+        other = Relational(self.x, sp.Lt, sp.Integer(9))
+        other.operator = sp.Le
+        assert str(self.quant) is first
+
+    def test_child_parts_are_memoized(self, monkeypatch):
+        """Test that rendering a parent memoizes the parts of every node below it."""
+        str(self.quant)
+        calls = []
+        original = Relational._render_parts
+        monkeypatch.setattr(Relational, "_render_parts", lambda node, mode: calls.append(node) or original(node, mode))
+        assert str(self.logical) == "(x < 5 ∧ y ≤ 3)"
+        assert calls == []
+        self.rel1.right = sp.Integer(6)
+        assert str(self.logical) == "(x < 6 ∧ y ≤ 3)"
+        assert calls == [self.rel1]
+
+    def test_shared_child_invalidates_every_parent(self):
+        """Test that mutating a shared descendant invalidates every cached ancestor, and only those."""
+        other = Logical([self.rel2, Relational(self.y, sp.Eq, sp.Integer(0))], "disjunction")
+        outer = Logical([self.quant, other], "conjunction")
+        unrelated = Logical([self.rel1, Relational(self.x, sp.Eq, sp.Integer(1))], "conjunction")
+        str(outer)
+        str(other)
+        kept = str(unrelated)
+        self.rel2.right = sp.Integer(4)
+        assert str(outer) == "(∀x, y (x < 5 → (x < 5 ∧ y ≤ 4)) ∧ (y ≤ 4 ∨ y = 0))"
+        assert str(other) == "(y ≤ 4 ∨ y = 0)"
+        assert str(unrelated) is kept
+
+    def test_pickle_rendered_tree(self):
+        """Test that a rendered statement pickles and its copy renders and invalidates on its own."""
+        outer = Logical([self.quant, self.rel2], "conjunction")
+        text = str(outer)
+        restored = pickle.loads(pickle.dumps(outer))
+        assert str(restored) == text
+        restored.elements[1].right = sp.Integer(4)
+        assert str(restored) == "(∀x, y (x < 5 → (x < 5 ∧ y ≤ 4)) ∧ y ≤ 4)"
+        assert str(outer) is text
+
+    def test_mutate_deepcopy(self):
+        """Test that mutating a deep copy invalidates the copy's rendering and not the original's."""
+        outer = Logical([self.quant, self.rel2], "conjunction")
+        text = str(outer)
+        copied = copy.deepcopy(outer)
+        copied.elements[1].right = sp.Integer(10)
+        assert str(copied) == "(∀x, y (x < 5 → (x < 5 ∧ y ≤ 10)) ∧ y ≤ 10)"
+        assert str(outer) is text
+        assert str(self.rel2) == "y ≤ 3"
+
+    def test_write_to(self):
+        """Test that streaming output matches str and repr."""
+        for buffer_size in [1, 65536]:
+            stream = io.StringIO()
+            self.quant.write_to(stream, buffer_size=buffer_size)
+            assert stream.getvalue() == str(self.quant)
+
+            stream = io.StringIO()
+            self.quant.write_to(stream, mode="repr", buffer_size=buffer_size)
+            assert stream.getvalue() == repr(self.quant)
+
+        with pytest.raises(ValueError, match="Mode must be one of"):
+            self.quant.write_to(io.StringIO(), mode="latex")
+
+    def test_deep_tree_rendering(self):
+        """Test that statements deeper than the recursion limit can be rendered."""
+        depth = sys.getrecursionlimit() * 3
+        stmt = self.rel1
+        for _ in range(depth):
+            stmt = Logical([self.rel2, stmt], "conjunction")
+
+        text = str(stmt)
+        assert text.startswith("(y ≤ 3 ∧ (y ≤ 3 ∧ ")
+        assert text.endswith("x < 5" + ")" * depth)
+
+        stream = io.StringIO()
+        stmt.write_to(stream)
+        assert stream.getvalue() == text
+
+
+if __name__ == "__main__":
+    # Run tests if this file is executed directly
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,108 @@
+import pytest
+import sympy as sp
+import sys
+import os
+
+# Add the parent directory to the path so we can import the modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from relational import Relational
+from quantified import Quantified
+from logical import Logical
+from traversal import (children, preorder, postorder, walk_paths, replace_at,
+                       StatementVisitor, StatementTransformer)
+
+
+class TestTraversal:
+    """Test cases for iterative traversal of statement trees."""
+
+    def setup_method(self):
+        """Set up test fixtures before each test method."""
+        self.x = sp.Symbol('x')
+        self.y = sp.Symbol('y')
+
+        self.rel1 = Relational(self.x, sp.Lt, sp.Integer(5))
+        self.rel2 = Relational(self.y, sp.Le, sp.Integer(3))
+        self.logical = Logical([self.rel1, self.rel2], "conjunction")
+        self.quant = Quantified([self.x, self.y], self.rel1, self.logical, "universal")
+
+    def deep_chain(self, depth):
+        """Build a right-nested conjunction with depth Logical nodes."""
+        stmt = self.rel1
+        for _ in range(depth):
+            stmt = Logical([self.rel2, stmt], "conjunction")
+        return stmt
+
+    def test_children(self):
+        """Test that children returns the direct sub-statements in order."""
+        assert children(self.rel1) == []
+        assert children(self.logical) == [self.rel1, self.rel2]
+        assert children(self.quant) == [self.rel1, self.logical]
+
+    def test_preorder_and_postorder(self):
+        """Test that traversal orders visit parents before or after children."""
+        assert list(preorder(self.quant)) == [self.quant, self.rel1, self.logical, self.rel1, self.rel2]
+        assert list(postorder(self.quant)) == [self.rel1, self.rel1, self.rel2, self.logical, self.quant]
+
+    def test_walk_paths_and_replace_at(self):
+        """Test that paths locate sub-statements and replacement copies only the path."""
+        paths = dict(walk_paths(self.quant))
+        assert paths[()] is self.quant
+        assert paths[(1, 1)] is self.rel2
+
+        replacement = Relational(self.y, sp.Lt, sp.Integer(0))
+        result = replace_at(self.quant, (1, 1), replacement)
+        assert str(result) == "∀x, y (x < 5 → (x < 5 ∧ y < 0))"
+        assert result.domain is self.rel1
+        assert result.predicate.elements[0] is self.rel1
+        assert str(self.quant) == "∀x, y (x < 5 → (x < 5 ∧ y ≤ 3))"
+        assert replace_at(self.quant, (), replacement) is replacement
+
+    def test_traversal_is_lazy(self):
+        """Test that traversal generators stream nodes without walking the whole tree."""
+        nodes = preorder(self.deep_chain(10))
+        assert next(nodes).is_logical()
+        assert next(nodes) is self.rel2
+
+    def test_deep_tree_beyond_recursion_limit(self):
+        """Test that trees deeper than the recursion limit can be traversed and visited."""
+        depth = sys.getrecursionlimit() * 3
+        stmt = self.deep_chain(depth)
+
+        assert sum(1 for _ in preorder(stmt)) == 2 * depth + 1
+        assert sum(1 for _ in postorder(stmt)) == 2 * depth + 1
+
+        class DepthVisitor(StatementVisitor):
+            def generic_visit(self, node, child_results):
+                return 1 + max(child_results, default=0)
+
+        assert DepthVisitor().visit(stmt) == depth + 1
+
+    def test_deep_quantification_validation(self):
+        """Test that variable quantification validation does not recurse."""
+        stmt = self.deep_chain(sys.getrecursionlimit() * 3)
+        quant = Quantified([self.x, self.y], self.rel1, stmt, "universal")
+        assert quant.predicate is stmt
+
+    def test_transformer_rebuilds_only_changed_paths(self):
+        """Test that the transformer shares untouched subtrees."""
+        target = self.rel2
+        replacement = Relational(self.y, sp.Lt, sp.Integer(0))
+
+        class ReplaceRel2(StatementTransformer):
+            def visit_Relational(self, node, child_results):
+                return replacement if node is target else node
+
+        result = ReplaceRel2().transform(self.quant)
+
+        assert result is not self.quant
+        assert result.domain is self.rel1
+        assert result.predicate.elements == [self.rel1, replacement]
+        assert str(self.quant) == "∀x, y (x < 5 → (x < 5 ∧ y ≤ 3))"
+
+        assert StatementTransformer().transform(self.quant) is self.quant
+
+
+if __name__ == "__main__":
+    # Run tests if this file is executed directly
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,119 @@
+from math_statement import QUANTIFIED, LOGICAL
+
+
+def children(node):
+    """Return the direct sub-statements of node, in a fixed order."""
+    kind = node.kind
+    if kind is LOGICAL:
+        return node.elements
+    if kind is QUANTIFIED:
+        return [node.domain, node.predicate]
+    return []
+
+
+def preorder(node):
+    """Yield node and all of its sub-statements, parents before children."""
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        yield current
+        stack.extend(reversed(children(current)))
+
+
+def postorder(node):
+    """Yield all sub-statements of node and then node itself, children before parents."""
+    stack = [(node, False)]
+    while stack:
+        current, expanded = stack.pop()
+        if expanded:
+            yield current
+            continue
+        stack.append((current, True))
+        stack.extend((child, False) for child in reversed(children(current)))
+
+
+def walk_paths(node):
+    """Yield (path, sub-statement) pairs in pre-order; path holds child indices from node."""
+    stack = [((), node)]
+    while stack:
+        path, current = stack.pop()
+        yield path, current
+        stack.extend((path + (i,), child) for i, child in reversed(list(enumerate(children(current)))))
+
+
+def replace_at(node, path, replacement):
+    """
+    Return a copy of node with the sub-statement at path replaced.
+
+    Only the nodes along path are copied; every other subtree is shared with node. The copies
+    skip re-validation, so replacement must not introduce variables unbound at that position.
+    """
+    ancestors = []
+    current = node
+    for index in path:
+        ancestors.append((current, index))
+        current = children(current)[index]
+
+    for parent, index in reversed(ancestors):
+        new_children = children(parent)
+        new_children[index] = replacement
+        if parent.kind is LOGICAL:
+            replacement = type(parent)._unchecked(new_children, parent.type)
+        else:
+            replacement = type(parent)._unchecked(parent.variables, new_children[0], new_children[1], parent.type)
+    return replacement
+
+
+class StatementVisitor:
+    """
+    Bottom-up visitor over a MathStatement tree.
+
+    visit(node) calls visit_<ClassName>(node, child_results) for every node in post-order,
+    where child_results holds the values returned for children(node). Nodes without a
+    specific method fall back to generic_visit. Results are threaded through an explicit
+    stack, so the depth of the tree is not limited by the recursion limit.
+    """
+
+    def _method_for(self, node_type):
+        """Return the visit method for node_type, resolved once per type."""
+        dispatch = self.__dict__.setdefault("_dispatch", {})
+        if node_type not in dispatch:
+            dispatch[node_type] = getattr(self, f"visit_{node_type.__name__}", self.generic_visit)
+        return dispatch[node_type]
+
+    def visit(self, node):
+        results = []
+        for current in postorder(node):
+            count = len(children(current))
+            if count:
+                child_results = results[-count:]
+                del results[-count:]
+            else:
+                child_results = []
+            results.append(self._method_for(type(current))(current, child_results))
+        return results[0]
+
+    def generic_visit(self, node, child_results):
+        """Called for nodes without a specific visit method; returns None by default."""
+        return None
+
+
+class StatementTransformer(StatementVisitor):
+    """
+    Bottom-up rewriter of MathStatement trees.
+
+    Subclasses override visit_<ClassName>(node, child_results) to return a replacement
+    statement. By default a node is rebuilt only if one of its children was replaced, so
+    untouched subtrees are shared between the input and the output.
+    """
+
+    def transform(self, node):
+        return self.visit(node)
+
+    def generic_visit(self, node, child_results):
+        original = children(node)
+        if all(new is old for new, old in zip(child_results, original)):
+            return node
+        if node.is_logical():
+            return type(node)(child_results, node.type)
+        return type(node)(node.variables, child_results[0], child_results[1], node.type)